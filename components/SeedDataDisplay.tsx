@@ -111,9 +111,11 @@ function HexStreamGrid({ clientSeed }: { clientSeed: number }) {
 function PrimeMatrix({ clientSeed }: { clientSeed: number }) {
   const text = useMemo(() => {
     const rng = mulberry32(clientSeed);
+    // Background cells skip 251 so the planted cell is the only FB (matching Python)
     const cells: number[] = [];
     for (let i = 0; i < 10000; i++) {
-      cells.push(rngInt(rng, 0, 255));
+      const v = rngInt(rng, 0, 254);
+      cells.push(v >= 251 ? v + 1 : v);
     }
     const px = rngInt(rng, 0, 99);
     const py = rngInt(rng, 0, 99);
@@ -5,6 +5,8 @@ import { hashAnswer } from "@/lib/banks/shared";
 import { mulberry32 } from "@/lib/engine/rng";
 import { SEED_RENDERER_TYPES } from "@/components/SeedDataDisplay";
 import parityData from "@/lib/data/mulberry32_parity.json";
+import parityCorpus from "@/lib/data/mulberry32_parity_corpus.json";
+import { createHash } from "crypto";
 
 // ── Dataset integrity ───────────────────────────────────────────────────────
 
@@ -243,6 +245,19 @@ describe("mulberry32 parity", () => {
       }
     });
   }
+
+  // 10,000 seeds x 1,000 draws built by scripts/rng_parity.py from the
+  // Python scalar port; the manifest carries the SHA-256 of the uint32 corpus.
+  it(`rng.ts reproduces the ${parityCorpus.seeds.length}-seed parity corpus digest`, () => {
+    const out = new Uint32Array(parityCorpus.seeds.length * parityCorpus.draws);
+    let k = 0;
+    for (const seed of parityCorpus.seeds) {
+      const rng = mulberry32(seed);
+      for (let i = 0; i < parityCorpus.draws; i++) out[k++] = rng() * 4294967296;
+    }
+    const digest = createHash("sha256").update(new Uint8Array(out.buffer)).digest("hex");
+    expect(digest).toBe(parityCorpus.sha256);
+  });
 });
 
 // ── Hash normalization tests ────────────────────────────────────────────────
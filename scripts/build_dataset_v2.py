@@ -14,6 +14,23 @@ import sys
 from pathlib import Path
 from collections import Counter
 
+import numpy as np
+
+from scca_bitops import compile_chain
+from scca_circuits import circuit_analysis
+from scca_needles import even_xor_pairs, parity_key
+from scca_numtheory import discrete_log, linear_recurrence, multiplicative_order
+from scca_regmachine import run_programs
+from scca_seeds import seed_search
+from scca_rng import (
+    Mulberry32Lanes,
+    letter_strings,
+    mulberry32,
+    mulberry32_randint,
+    mulberry32_randint_lanes,
+    mulberry32_shuffle_lanes,
+)
+
 # ── Paths ────────────────────────────────────────────────────────────────────
 
 ROOT = Path(__file__).resolve().parent.parent
@@ -67,11 +84,36 @@ def hash_answer(answer: str, normalization: str, decimal_places: int | None = No
 
 # ── ID generation ────────────────────────────────────────────────────────────
 
-_id_counter = 0
-def make_id(section: str, tier: int, subtype: str) -> str:
-    global _id_counter
-    _id_counter += 1
-    return f"{section}-t{tier}-{subtype}-{_id_counter:04d}"
+# Numbers already used before each builder's block in the shipped dataset,
+# which was numbered by one global counter in build order. Keeping them as
+# fixed offsets leaves every shipped ID unchanged.
+ID_BASES = {
+    "isomorphism": 0,
+    "cognitive-stack": 25,
+    "proof-error": 50,
+    "assembly-trace": 75,
+    "grammar-violation": 100,
+    "expert-trap": 125,
+    "cipher-chain-small": 150,
+    "hex-xor-match-small": 155,
+    "ledger-running-balance-small": 160,
+    "discrete-log-small": 165,
+    "recurrence-modular-small": 170,
+    "xor-chain-small": 174,
+    "logic-circuit-small": 179,
+    "register-machine-sim": 184,
+    "vigenere-decrypt": 194,
+}
+
+
+def make_id(section: str, tier: int, subtype: str, index: int) -> str:
+    """ID for item `index` (0-based) of one builder's output.
+
+    Numbered from the builder's fixed ID_BASES offset rather than one global
+    counter, so an ID does not depend on which builders ran before it (like
+    item_rng's seeds), and a rebuild reproduces the shipped IDs.
+    """
+    return f"{section}-t{tier}-{subtype}-{ID_BASES.get(subtype, 0) + index + 1:04d}"
 
 # ── Load raw banks ───────────────────────────────────────────────────────────
 
@@ -87,6 +129,21 @@ def load_existing_master():
     with open(MASTER_PATH) as f:
         return json.load(f)
 
+# ── Per-item random streams ──────────────────────────────────────────────────
+
+T1_SEED = 42
+
+def item_rng(builder: str, index: int, item: dict) -> random.Random:
+    """Independent random stream for one T1 item's distractors and shuffles.
+
+    Seeded from (builder, item index, bank item id) instead of one global
+    stream, so no item depends on the items built before it: builders can
+    run in any order or on separate workers, and an item rebuilt alone
+    comes out identical. (str seeds hash through SHA-512, not hash(), so
+    they are stable across processes.)
+    """
+    return random.Random(f"{T1_SEED}:{builder}:{index}:{item.get('id', '')}")
+
 # ── T1 generators ────────────────────────────────────────────────────────────
 
 def build_isomorphism_t1(banks) -> list[dict]:
@@ -97,14 +154,15 @@ def build_isomorphism_t1(banks) -> list[dict]:
     questions = []
 
     for i, item in enumerate(items[:25]):
+        rng = item_rng("isomorphism", i, item)
         correct = item["answer"]
         # Get 7 distractors from other items with different target fields
         candidates = [a for j, a in enumerate(all_answers) if j != i and a != correct]
-        random.shuffle(candidates)
+        rng.shuffle(candidates)
         distractors = candidates[:7]
 
         options = distractors + [correct]
-        random.shuffle(options)
+        rng.shuffle(options)
         correct_idx = options.index(correct)
 
         prompt = (
@@ -114,7 +172,7 @@ def build_isomorphism_t1(banks) -> list[dict]:
         )
 
         questions.append({
-            "id": make_id("structural", 1, "isomorphism"),
+            "id": make_id("structural", 1, "isomorphism", i),
             "section": "structural",
             "subtype": "isomorphism",
             "tier": 1,
@@ -185,6 +243,7 @@ def build_cognitive_stack_t1(banks) -> list[dict]:
             if used >= 25:
                 break
             item = pool[i]
+            rng = item_rng(f"cognitive-stack/{subtype}", i, item)
             correct = item["answer"]
             correct_fmt = _classify_answer_format(correct)
 
@@ -196,10 +255,10 @@ def build_cognitive_stack_t1(banks) -> list[dict]:
                 if j != i:
                     cross_alts.extend(p.get("alternatives", []))
 
-            all_candidates = list(set(item_alts + cross_answers + cross_alts) - {correct})
+            all_candidates = sorted(set(item_alts + cross_answers + cross_alts) - {correct})
             # Filter to same format class
             format_matched = [c for c in all_candidates if _classify_answer_format(c) == correct_fmt]
-            random.shuffle(format_matched)
+            rng.shuffle(format_matched)
             distractors = format_matched[:7]
 
             # Fill remaining slots with format-appropriate generated fillers
@@ -215,7 +274,7 @@ def build_cognitive_stack_t1(banks) -> list[dict]:
                     except ValueError:
                         pass
                 offsets = [-3, -2, -1, 1, 2, 3, 4, 5, 6, 7]
-                random.shuffle(offsets)
+                rng.shuffle(offsets)
                 for off in offsets:
                     if len(distractors) >= 7:
                         break
@@ -225,7 +284,7 @@ def build_cognitive_stack_t1(banks) -> list[dict]:
                         existing_nums.add(candidate_num)
             elif correct_fmt == "short":
                 filler_pool = [e for e in short_entity_pool if e != correct and e not in distractors]
-                random.shuffle(filler_pool)
+                rng.shuffle(filler_pool)
                 while len(distractors) < 7 and filler_pool:
                     distractors.append(filler_pool.pop())
             # Long fallback (also covers any remaining shortfall)
@@ -235,13 +294,13 @@ def build_cognitive_stack_t1(banks) -> list[dict]:
                 distractors.append(f"[Alternative reading {filler_idx}]")
 
             options = distractors + [correct]
-            random.shuffle(options)
+            rng.shuffle(options)
             correct_idx = options.index(correct)
 
             prompt = f"{item['text']}\n\n{item['question']}"
 
             questions.append({
-                "id": make_id("state-tracking", 1, "cognitive-stack"),
+                "id": make_id("state-tracking", 1, "cognitive-stack", used),
                 "section": "state-tracking",
                 "subtype": "cognitive-stack",
                 "tier": 1,
@@ -273,13 +332,14 @@ def build_proof_error_t1(banks) -> list[dict]:
 
     questions = []
     for i, item in enumerate(all_proofs[:25]):
+        rng = item_rng("proof-error", i, item)
         correct = item["errorExplanation"]
         own_distractors = item.get("distractorExplanations", [])[:3]
 
         # Cross-pollinate from other items
         cross = [d for j, p in enumerate(all_proofs) for d in p.get("distractorExplanations", [])
                  if j != i and d != correct and d not in own_distractors]
-        random.shuffle(cross)
+        rng.shuffle(cross)
         cross_distractors = cross[:max(0, 7 - len(own_distractors))]
 
         distractors = own_distractors + cross_distractors
@@ -291,11 +351,11 @@ def build_proof_error_t1(banks) -> list[dict]:
         prompt = f"Proof: \"{item['title']}\"\n\n{steps_text}\n\nIdentify the error in this proof."
 
         options = distractors + [correct]
-        random.shuffle(options)
+        rng.shuffle(options)
         correct_idx = options.index(correct)
 
         questions.append({
-            "id": make_id("sequential-depth", 1, "proof-error"),
+            "id": make_id("sequential-depth", 1, "proof-error", i),
             "section": "sequential-depth",
             "subtype": "proof-error",
             "tier": 1,
@@ -322,6 +382,7 @@ def build_assembly_trace_t1(banks) -> list[dict]:
     questions = []
 
     for i, item in enumerate(items[:25]):
+        rng = item_rng("assembly-trace", i, item)
         correct_val = item["expectedEax"]
         existing_opts = item["options"]  # 4 options
         correct_option_idx = item["correctOptionIndex"]
@@ -355,13 +416,13 @@ def build_assembly_trace_t1(banks) -> list[dict]:
             all_opts.append(str(correct_val + len(all_opts) + 10))
         all_opts = all_opts[:8]
 
-        random.shuffle(all_opts)
+        rng.shuffle(all_opts)
         correct_idx = all_opts.index(correct_str)
 
         prompt = f"What is the value of EAX after executing this x86 assembly?\n\n{item['code']}"
 
         questions.append({
-            "id": make_id("sequential-depth", 1, "assembly-trace"),
+            "id": make_id("sequential-depth", 1, "assembly-trace", i),
             "section": "sequential-depth",
             "subtype": "assembly-trace",
             "tier": 1,
@@ -393,12 +454,13 @@ def build_grammar_violation_t1(banks) -> list[dict]:
 
     questions = []
     for i, item in enumerate(all_grammar[:25]):
+        rng = item_rng("grammar-violation", i, item)
         correct = item["violation"]
         own_distractors = item.get("distractors", [])[:3]
 
         # Cross-pollinate
-        cross = list(master_pool - {correct} - set(own_distractors))
-        random.shuffle(cross)
+        cross = sorted(master_pool - {correct} - set(own_distractors))
+        rng.shuffle(cross)
         cross_distractors = cross[:max(0, 7 - len(own_distractors))]
 
         distractors = own_distractors + cross_distractors
@@ -409,11 +471,11 @@ def build_grammar_violation_t1(banks) -> list[dict]:
         prompt = f"Identify the grammatical violation in the following sentence:\n\n\"{item['sentence']}\""
 
         options = distractors + [correct]
-        random.shuffle(options)
+        rng.shuffle(options)
         correct_idx = options.index(correct)
 
         questions.append({
-            "id": make_id("signal-detection", 1, "grammar-violation"),
+            "id": make_id("signal-detection", 1, "grammar-violation", i),
             "section": "signal-detection",
             "subtype": "grammar-violation",
             "tier": 1,
@@ -506,6 +568,7 @@ def build_expert_trap_t1(banks) -> list[dict]:
 
     questions = []
     for i, item in enumerate(items[:25]):
+        rng = item_rng("expert-trap", i, item)
         correct = item["answer"]
         my_cat = _field_to_category(item["field"])
 
@@ -513,14 +576,14 @@ def build_expert_trap_t1(banks) -> list[dict]:
         same_cat = []
         if my_cat:
             same_cat = [a for j, a in cat_index.get(my_cat, []) if j != i and a != correct]
-        random.shuffle(same_cat)
+        rng.shuffle(same_cat)
         distractors = same_cat[:7]
 
         # 2) If < 7, fill from other categories
         if len(distractors) < 7:
             other = [it2["answer"] for j, it2 in enumerate(items) if j != i
                      and it2["answer"] != correct and it2["answer"] not in distractors]
-            random.shuffle(other)
+            rng.shuffle(other)
             distractors.extend(other[:7 - len(distractors)])
 
         prompt = (
@@ -530,11 +593,11 @@ def build_expert_trap_t1(banks) -> list[dict]:
         )
 
         options = distractors + [correct]
-        random.shuffle(options)
+        rng.shuffle(options)
         correct_idx = options.index(correct)
 
         questions.append({
-            "id": make_id("probabilistic", 1, "expert-trap"),
+            "id": make_id("probabilistic", 1, "expert-trap", i),
             "section": "probabilistic",
             "subtype": "expert-trap",
             "tier": 1,
@@ -553,79 +616,36 @@ def build_expert_trap_t1(banks) -> list[dict]:
 
     return questions
 
-# ── mulberry32 PRNG (matches lib/engine/rng.ts) ──────────────────────────────
-
-def _i32(x):
-    """Truncate to signed 32-bit integer (JS |0)."""
-    x = x & 0xFFFFFFFF
-    return x - 0x100000000 if x >= 0x80000000 else x
-
-def _u32(x):
-    """Truncate to unsigned 32-bit integer (JS >>> 0)."""
-    return x & 0xFFFFFFFF
-
-def _imul(a, b):
-    """Emulate Math.imul: 32-bit signed multiplication."""
-    return _i32((_u32(a) * _u32(b)) & 0xFFFFFFFF)
-
-def mulberry32(seed):
-    """Port of the JS mulberry32 PRNG. Returns a callable yielding floats in [0,1)."""
-    state = [_i32(seed)]
-    def rng():
-        state[0] = _i32(state[0] + 0x6D2B79F5)
-        s = state[0]
-        t = _imul(s ^ (_u32(s) >> 15), 1 | s)
-        t = _i32(t + _imul(t ^ (_u32(t) >> 7), 61 | t)) ^ t
-        return _u32(t ^ (_u32(t) >> 14)) / 4294967296
-    return rng
-
-def mb_randint(rng, lo, hi):
-    """Random int in [lo, hi) using mulberry32 rng."""
-    return lo + int(rng() * (hi - lo))
-
 # ── T3 hardened generators ───────────────────────────────────────────────────
 
 def generate_register_machine_sim() -> list[dict]:
     """T3 state-tracking: 10 register-machine simulation questions (seeds 5000-5009)."""
-    questions = []
+    programs = []
     for i in range(10):
         rng = mulberry32(5000 + i)
 
-        regs = [mb_randint(rng, 0, 256) for _ in range(4)]
-        initial_regs = regs[:]
+        initial_regs = [mulberry32_randint(rng, 0, 256) for _ in range(4)]
 
         opcodes = ['ADD', 'SUB', 'XOR', 'SHL', 'CMP']
         instructions = []
         for _ in range(20):
-            op = opcodes[mb_randint(rng, 0, 5)]
-            dst = mb_randint(rng, 0, 4)
+            op = opcodes[mulberry32_randint(rng, 0, 5)]
+            dst = mulberry32_randint(rng, 0, 4)
             if op == 'CMP':
-                src = mb_randint(rng, 0, 4)
+                src = mulberry32_randint(rng, 0, 4)
                 instructions.append((op, dst, src, None))
             elif op == 'SHL':
-                k = mb_randint(rng, 1, 4)
+                k = mulberry32_randint(rng, 1, 4)
                 instructions.append((op, dst, None, k))
             else:
-                src = mb_randint(rng, 0, 4)
+                src = mulberry32_randint(rng, 0, 4)
                 instructions.append((op, dst, src, None))
+        programs.append((initial_regs, instructions))
 
-        sim_regs = initial_regs[:]
-        pc = 0
-        while pc < len(instructions):
-            op, dst, src, imm = instructions[pc]
-            if op == 'ADD':
-                sim_regs[dst] = (sim_regs[dst] + sim_regs[src]) % 256
-            elif op == 'SUB':
-                sim_regs[dst] = (sim_regs[dst] - sim_regs[src]) % 256
-            elif op == 'XOR':
-                sim_regs[dst] = sim_regs[dst] ^ sim_regs[src]
-            elif op == 'SHL':
-                sim_regs[dst] = (sim_regs[dst] << imm) & 0xFF
-            elif op == 'CMP':
-                if sim_regs[dst] > sim_regs[src]:
-                    pc += 1  # Skip next instruction
-            pc += 1
+    final = run_programs([regs for regs, _ in programs], [instr for _, instr in programs])["regs"]
 
+    questions = []
+    for i, ((initial_regs, instructions), sim_regs) in enumerate(zip(programs, final.tolist())):
         answer = ",".join(str(r) for r in sim_regs)
 
         reg_init = ", ".join(f"R{j}={initial_regs[j]}" for j in range(4))
@@ -649,7 +669,7 @@ def generate_register_machine_sim() -> list[dict]:
         )
 
         questions.append({
-            "id": make_id("state-tracking", 3, "register-machine-sim"),
+            "id": make_id("state-tracking", 3, "register-machine-sim", i),
             "section": "state-tracking",
             "subtype": "register-machine-sim",
             "tier": 3,
@@ -675,8 +695,8 @@ def generate_vigenere_decrypt() -> list[dict]:
     for i in range(10):
         rng = mulberry32(5400 + i)
 
-        keyword = "".join(chr(ord('a') + mb_randint(rng, 0, 26)) for _ in range(5))
-        plaintext = "".join(chr(ord('a') + mb_randint(rng, 0, 26)) for _ in range(30))
+        keyword = "".join(chr(ord('a') + mulberry32_randint(rng, 0, 26)) for _ in range(5))
+        plaintext = "".join(chr(ord('a') + mulberry32_randint(rng, 0, 26)) for _ in range(30))
 
         ciphertext = ""
         for j, ch in enumerate(plaintext):
@@ -686,7 +706,7 @@ def generate_vigenere_decrypt() -> list[dict]:
         known_pairs = []
         for pos in range(5):
             candidates = [j for j in range(30) if j % 5 == pos]
-            chosen = candidates[mb_randint(rng, 0, len(candidates))]
+            chosen = candidates[mulberry32_randint(rng, 0, len(candidates))]
             known_pairs.append((chosen, plaintext[chosen], ciphertext[chosen]))
 
         pairs_text = "\n".join(
@@ -704,7 +724,7 @@ def generate_vigenere_decrypt() -> list[dict]:
         )
 
         questions.append({
-            "id": make_id("state-tracking", 3, "vigenere-decrypt"),
+            "id": make_id("state-tracking", 3, "vigenere-decrypt", i),
             "section": "state-tracking",
             "subtype": "vigenere-decrypt",
             "tier": 3,
@@ -726,25 +746,41 @@ def generate_vigenere_decrypt() -> list[dict]:
 
 # ── T2 hardened generators ───────────────────────────────────────────────────
 
+def cipher_chain_small_batch(seeds: list[int]) -> dict[str, np.ndarray]:
+    """Columnar cipher-chain-small items, one mulberry32 lane per seed.
+
+    Row i is exactly what the scalar draw order yields for seeds[i]: two
+    Fisher-Yates substitution tables, then an 8-letter plaintext.
+    cipher1/cipher2 are (n, 26) letter indices (column c is the image of
+    letter c); plaintext/intermediate/result are 8-letter strings.
+    """
+    lanes = Mulberry32Lanes(seeds)
+    cipher1 = np.tile(np.arange(26, dtype=np.int64), (len(lanes), 1))
+    mulberry32_shuffle_lanes(lanes, cipher1)
+    cipher2 = np.tile(np.arange(26, dtype=np.int64), (len(lanes), 1))
+    mulberry32_shuffle_lanes(lanes, cipher2)
+    plaintext = mulberry32_randint_lanes(lanes, 0, 26, 8)
+    intermediate = np.take_along_axis(cipher1, plaintext, axis=1)
+    result = np.take_along_axis(cipher2, intermediate, axis=1)
+    return {
+        "seed": np.asarray(seeds, dtype=np.int64),
+        "cipher1": cipher1,
+        "cipher2": cipher2,
+        "plaintext": letter_strings(plaintext),
+        "intermediate": letter_strings(intermediate),
+        "result": letter_strings(result),
+    }
+
+
 def generate_cipher_chain_small() -> list[dict]:
     """T2 state-tracking: 5 double-substitution cipher questions (seeds 5100-5104)."""
+    batch = cipher_chain_small_batch([5100 + i for i in range(5)])
     questions = []
     for i in range(5):
-        rng = mulberry32(5100 + i)
-
-        def make_cipher(r):
-            letters = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
-            for j in range(25, 0, -1):
-                k = mb_randint(r, 0, j + 1)
-                letters[j], letters[k] = letters[k], letters[j]
-            return {chr(ord('A') + idx): letters[idx] for idx in range(26)}
-
-        cipher1 = make_cipher(rng)
-        cipher2 = make_cipher(rng)
-
-        plaintext = "".join(chr(ord('A') + mb_randint(rng, 0, 26)) for _ in range(8))
-        intermediate = "".join(cipher1[ch] for ch in plaintext)
-        result = "".join(cipher2[ch] for ch in intermediate)
+        cipher1 = {chr(ord('A') + idx): chr(ord('A') + v) for idx, v in enumerate(batch["cipher1"][i].tolist())}
+        cipher2 = {chr(ord('A') + idx): chr(ord('A') + v) for idx, v in enumerate(batch["cipher2"][i].tolist())}
+        plaintext = str(batch["plaintext"][i])
+        result = str(batch["result"][i])
 
         def format_table(cipher, name):
             pairs = [f"{k}->{v}" for k, v in sorted(cipher.items())]
@@ -762,7 +798,7 @@ def generate_cipher_chain_small() -> list[dict]:
         )
 
         questions.append({
-            "id": make_id("state-tracking", 2, "cipher-chain-small"),
+            "id": make_id("state-tracking", 2, "cipher-chain-small", i),
             "section": "state-tracking",
             "subtype": "cipher-chain-small",
             "tier": 2,
@@ -782,52 +818,69 @@ def generate_cipher_chain_small() -> list[dict]:
     return questions
 
 
+EVEN_HEX_DIGITS = [0, 2, 4, 6, 8, 0xA, 0xC, 0xE]
+
+
+def hex_digits_draw(rng, width: int) -> int:
+    """A uniform width-digit hex value, drawn 6 digits (24 bits) at a time so
+    every digit stays random beyond the 32 bits of one draw."""
+    v = 0
+    for done in range(0, width, 6):
+        chunk = min(6, width - done)
+        v = (v << 4 * chunk) | mulberry32_randint(rng, 0, 16 ** chunk)
+    return v
+
+
+def hex_xor_haystack(rng, n_others: int, width: int = 6) -> dict:
+    """A planted pair (a, b) whose XOR has all-even hex digits, plus n_others
+    strings that form no such pair with anything else.
+
+    Candidates are rejected by parity_key (the low bit of every digit), a
+    set lookup per draw instead of an XOR against every accepted string, so
+    10^4+ strings are cheap once width leaves room: a haystack can only hold
+    2^width distinct keys. `pairs` is the exact even-XOR pair count of the
+    finished haystack (1 by construction).
+    """
+    if n_others + 1 > 1 << width:
+        raise ValueError(f"{n_others} other strings need more than 2^{width} parity keys")
+    a_val = hex_digits_draw(rng, width)
+    xor_result = 0
+    for _ in range(width):
+        digit = EVEN_HEX_DIGITS[mulberry32_randint(rng, 0, len(EVEN_HEX_DIGITS))]
+        xor_result = (xor_result << 4) | digit
+    b_val = a_val ^ xor_result
+
+    used = {parity_key(a_val, width)}
+    others = []
+    while len(others) < n_others:
+        v = hex_digits_draw(rng, width)
+        key = parity_key(v, width)
+        if key not in used:
+            used.add(key)
+            others.append(v)
+    values = [a_val, b_val] + others
+    return {
+        "a": f"{a_val:0{width}x}",
+        "b": f"{b_val:0{width}x}",
+        "others": [f"{v:0{width}x}" for v in others],
+        "pairs": even_xor_pairs(values, width),
+    }
+
+
 def generate_hex_xor_match_small() -> list[dict]:
     """T2 state-tracking: 5 hex-XOR-match questions (seeds 5200-5204)."""
     questions = []
     for i in range(5):
         rng = mulberry32(5200 + i)
 
-        even_digits = [0, 2, 4, 6, 8, 0xA, 0xC, 0xE]
-
-        def all_even_xor(a_hex, b_hex):
-            x = int(a_hex, 16) ^ int(b_hex, 16)
-            for _ in range(6):
-                if (x & 0xF) % 2 != 0:
-                    return False
-                x >>= 4
-            return True
-
-        # Generate the designed answer pair
-        a_val = mb_randint(rng, 0, 0x1000000)
-        xor_result = 0
-        for _ in range(6):
-            digit = even_digits[mb_randint(rng, 0, len(even_digits))]
-            xor_result = (xor_result << 4) | digit
-        b_val = a_val ^ xor_result
-        a_str = f"{a_val:06x}"
-        b_str = f"{b_val:06x}"
-
-        # Generate other strings that don't form valid pairs
-        existing = {a_str, b_str}
-        others = []
-        while len(others) < 28:
-            s = f"{mb_randint(rng, 0, 0x1000000):06x}"
-            if s in existing:
-                continue
-            conflict = False
-            for e in existing:
-                if all_even_xor(s, e):
-                    conflict = True
-                    break
-            if not conflict:
-                others.append(s)
-                existing.add(s)
+        hay = hex_xor_haystack(rng, 28)
+        assert hay["pairs"] == 1
+        a_str, b_str, others = hay["a"], hay["b"], hay["others"]
 
         all_strings = others[:]
-        pos_a = mb_randint(rng, 0, len(all_strings) + 1)
+        pos_a = mulberry32_randint(rng, 0, len(all_strings) + 1)
         all_strings.insert(pos_a, a_str)
-        pos_b = mb_randint(rng, 0, len(all_strings) + 1)
+        pos_b = mulberry32_randint(rng, 0, len(all_strings) + 1)
         all_strings.insert(pos_b, b_str)
 
         # Sort the answer pair alphabetically
@@ -846,7 +899,7 @@ def generate_hex_xor_match_small() -> list[dict]:
         )
 
         questions.append({
-            "id": make_id("state-tracking", 2, "hex-xor-match-small"),
+            "id": make_id("state-tracking", 2, "hex-xor-match-small", i),
             "section": "state-tracking",
             "subtype": "hex-xor-match-small",
             "tier": 2,
@@ -872,8 +925,8 @@ def generate_ledger_running_balance_small() -> list[dict]:
     for i in range(5):
         rng = mulberry32(5300 + i)
 
-        starting_balance = mb_randint(rng, 200, 600)
-        target_neg = mb_randint(rng, 12, 22)
+        starting_balance = mulberry32_randint(rng, 200, 600)
+        target_neg = mulberry32_randint(rng, 12, 22)
 
         transactions = []
         balance = starting_balance
@@ -881,17 +934,17 @@ def generate_ledger_running_balance_small() -> list[dict]:
 
         for j in range(25):
             if j == target_neg and first_negative_idx is None:
-                amount = -(balance + mb_randint(rng, 1, 50))
+                amount = -(balance + mulberry32_randint(rng, 1, 50))
             elif first_negative_idx is not None:
-                amount = mb_randint(rng, -80, 81)
+                amount = mulberry32_randint(rng, -80, 81)
             else:
                 max_debit = min(80, balance - 1)
                 if max_debit <= 0:
-                    amount = mb_randint(rng, 10, 100)
+                    amount = mulberry32_randint(rng, 10, 100)
                 elif rng() < 0.5:
-                    amount = mb_randint(rng, 10, 100)
+                    amount = mulberry32_randint(rng, 10, 100)
                 else:
-                    amount = -mb_randint(rng, 1, max_debit + 1)
+                    amount = -mulberry32_randint(rng, 1, max_debit + 1)
 
             transactions.append(amount)
             balance += amount
@@ -913,7 +966,7 @@ def generate_ledger_running_balance_small() -> list[dict]:
         )
 
         questions.append({
-            "id": make_id("state-tracking", 2, "ledger-running-balance-small"),
+            "id": make_id("state-tracking", 2, "ledger-running-balance-small", i),
             "section": "state-tracking",
             "subtype": "ledger-running-balance-small",
             "tier": 2,
@@ -933,31 +986,40 @@ def generate_ledger_running_balance_small() -> list[dict]:
     return questions
 
 
-def generate_discrete_log_small() -> list[dict]:
-    """T2 sequential-depth: 5 discrete-log questions (seeds 5500-5504)."""
-    primes = [17, 19, 23, 29, 31, 37, 41, 43]
-    questions = []
-    for i in range(5):
-        rng = mulberry32(5500 + i)
+DISCRETE_LOG_PRIMES = [17, 19, 23, 29, 31, 37, 41, 43]
+DISCRETE_LOG_RANGE = (5, 40)
 
-        p = primes[mb_randint(rng, 0, len(primes))]
-        base = mb_randint(rng, 2, p)
 
-        # Compute all powers
-        powers = {}
-        val = 1
-        for x in range(1, p):
-            val = (val * base) % p
-            if val not in powers:
-                powers[val] = x
+def discrete_log_draw(seed: int) -> dict:
+    """One discrete-log instance: prime, base and a target whose smallest
+    exponent lies in DISCRETE_LOG_RANGE (target None if the base's order is
+    too small for any). The answer comes from scca_numtheory.discrete_log."""
+    rng = mulberry32(seed)
+    p = DISCRETE_LOG_PRIMES[mulberry32_randint(rng, 0, len(DISCRETE_LOG_PRIMES))]
+    base = mulberry32_randint(rng, 2, p)
 
-        # Pick a target with x in [5, 40]
-        candidates = [(v, x) for v, x in powers.items() if 5 <= x <= 40]
-        if not candidates:
-            candidates = [(v, x) for v, x in powers.items() if x >= 2]
+    # Powers base^1 .. base^order are distinct, so the exponents in range
+    # are lo .. min(hi, order) and each names its own target.
+    lo, hi = DISCRETE_LOG_RANGE
+    count = min(hi, multiplicative_order(base, p)) - lo + 1
+    if count <= 0:
+        return {"p": p, "base": base, "target": None, "x": None}
+    target = pow(base, lo + mulberry32_randint(rng, 0, count), p)
+    return {"p": p, "base": base, "target": target, "x": discrete_log(base, target, p, positive=True)}
 
-        target, answer_x = candidates[mb_randint(rng, 0, len(candidates))]
-        answer = str(answer_x)
+
+def verify_discrete_log(item: dict) -> list[str]:
+    if item["target"] is None:
+        return [f"{item['base']} has no power in {DISCRETE_LOG_RANGE} mod {item['p']}"]
+    return []
+
+
+def generate_discrete_log_small() -> list[dict]:
+    """T2 sequential-depth: 5 discrete-log questions (first accepted seeds from 5500)."""
+    questions = []
+    for i, (_, item) in enumerate(seed_search(discrete_log_draw, verify_discrete_log, 5, 5500)):
+        p, base, target = item["p"], item["base"], item["target"]
+        answer = str(item["x"])
 
         prompt = (
             f"Find the smallest positive integer x such that {base}^x = {target} (mod {p}).\n\n"
@@ -965,7 +1027,7 @@ def generate_discrete_log_small() -> list[dict]:
         )
 
         questions.append({
-            "id": make_id("sequential-depth", 2, "discrete-log-small"),
+            "id": make_id("sequential-depth", 2, "discrete-log-small", i),
             "section": "sequential-depth",
             "subtype": "discrete-log-small",
             "tier": 2,
@@ -991,18 +1053,13 @@ def generate_recurrence_modular_small() -> list[dict]:
     for i in range(4):
         rng = mulberry32(5600 + i)
 
-        a = mb_randint(rng, 2, 8)
-        b = mb_randint(rng, 1, 6)
-        m = mb_randint(rng, 50, 200)
-        f0 = mb_randint(rng, 1, 20)
-        f1 = mb_randint(rng, 1, 20)
+        a = mulberry32_randint(rng, 2, 8)
+        b = mulberry32_randint(rng, 1, 6)
+        m = mulberry32_randint(rng, 50, 200)
+        f0 = mulberry32_randint(rng, 1, 20)
+        f1 = mulberry32_randint(rng, 1, 20)
 
-        prev2, prev1 = f0, f1
-        for _ in range(2, 13):
-            curr = (a * prev1 + b * prev2) % m
-            prev2, prev1 = prev1, curr
-
-        answer = str(prev1)
+        answer = str(linear_recurrence([a, b], [f0, f1], 12, m))
 
         prompt = (
             f"Given the recurrence relation:\n"
@@ -1013,7 +1070,7 @@ def generate_recurrence_modular_small() -> list[dict]:
         )
 
         questions.append({
-            "id": make_id("sequential-depth", 2, "recurrence-modular-small"),
+            "id": make_id("sequential-depth", 2, "recurrence-modular-small", i),
             "section": "sequential-depth",
             "subtype": "recurrence-modular-small",
             "tier": 2,
@@ -1039,29 +1096,17 @@ def generate_xor_chain_small() -> list[dict]:
     for i in range(5):
         rng = mulberry32(5700 + i)
 
-        def rot_left_16(val, k):
-            k = k % 16
-            return ((val << k) | (val >> (16 - k))) & 0xFFFF
-
-        def rot_right_16(val, k):
-            k = k % 16
-            return ((val >> k) | (val << (16 - k))) & 0xFFFF
-
-        initial = mb_randint(rng, 0, 0x10000)
-        xor1 = mb_randint(rng, 0, 0x10000)
-        rot_l = mb_randint(rng, 1, 8)
-        xor2 = mb_randint(rng, 0, 0x10000)
-        rot_r = mb_randint(rng, 1, 8)
-        xor3 = mb_randint(rng, 0, 0x10000)
+        initial = mulberry32_randint(rng, 0, 0x10000)
+        xor1 = mulberry32_randint(rng, 0, 0x10000)
+        rot_l = mulberry32_randint(rng, 1, 8)
+        xor2 = mulberry32_randint(rng, 0, 0x10000)
+        rot_r = mulberry32_randint(rng, 1, 8)
+        xor3 = mulberry32_randint(rng, 0, 0x10000)
 
-        val = initial
-        val = val ^ xor1
-        val = rot_left_16(val, rot_l)
-        val = val ^ xor2
-        val = rot_right_16(val, rot_r)
-        val = val ^ xor3
-
-        answer = f"{val:04x}"
+        chain = compile_chain(16, [
+            ("XOR", xor1), ("ROTL", rot_l), ("XOR", xor2), ("ROTR", rot_r), ("XOR", xor3),
+        ])
+        answer = f"{chain(initial):04x}"
 
         prompt = (
             f"Perform the following operations on a 16-bit value (all operations are 16-bit):\n\n"
@@ -1075,7 +1120,7 @@ def generate_xor_chain_small() -> list[dict]:
         )
 
         questions.append({
-            "id": make_id("sequential-depth", 2, "xor-chain-small"),
+            "id": make_id("sequential-depth", 2, "xor-chain-small", i),
             "section": "sequential-depth",
             "subtype": "xor-chain-small",
             "tier": 2,
@@ -1104,44 +1149,22 @@ def generate_logic_circuit_small() -> list[dict]:
     for i in range(5):
         rng = mulberry32(5800 + i)
 
-        inputs = [mb_randint(rng, 0, 2) for _ in range(6)]
+        inputs = [mulberry32_randint(rng, 0, 2) for _ in range(6)]
 
         gates = []
         for g in range(4):
-            gt = gate_types[mb_randint(rng, 0, len(gate_types))]
+            gt = gate_types[mulberry32_randint(rng, 0, len(gate_types))]
             available = list(range(6 + g))
-            in1 = available[mb_randint(rng, 0, len(available))]
-            in2 = available[mb_randint(rng, 0, len(available))]
+            in1 = available[mulberry32_randint(rng, 0, len(available))]
+            in2 = available[mulberry32_randint(rng, 0, len(available))]
             attempts = 0
             while in2 == in1 and attempts < 20:
-                in2 = available[mb_randint(rng, 0, len(available))]
+                in2 = available[mulberry32_randint(rng, 0, len(available))]
                 attempts += 1
             gates.append((gt, in1, in2))
 
-        def evaluate(input_vals):
-            vals = list(input_vals)
-            for gt, in1, in2 in gates:
-                a_v, b_v = vals[in1], vals[in2]
-                if gt == 'AND':
-                    vals.append(a_v & b_v)
-                elif gt == 'OR':
-                    vals.append(a_v | b_v)
-                elif gt == 'XOR':
-                    vals.append(a_v ^ b_v)
-                elif gt == 'NAND':
-                    vals.append(1 - (a_v & b_v))
-                elif gt == 'NOR':
-                    vals.append(1 - (a_v | b_v))
-            return vals[-1]
-
-        output = evaluate(inputs)
-
-        sensitive_count = 0
-        for j in range(6):
-            flipped = inputs[:]
-            flipped[j] = 1 - flipped[j]
-            if evaluate(flipped) != output:
-                sensitive_count += 1
+        res = circuit_analysis(6, gates, inputs)
+        output, sensitive_count = res["output"], res["sensitivity"]
 
         answer = f"{output},{sensitive_count}"
 
@@ -1165,7 +1188,7 @@ def generate_logic_circuit_small() -> list[dict]:
         )
 
         questions.append({
-            "id": make_id("state-tracking", 2, "logic-circuit-small"),
+            "id": make_id("state-tracking", 2, "logic-circuit-small", i),
             "section": "state-tracking",
             "subtype": "logic-circuit-small",
             "tier": 2,
@@ -1199,8 +1222,6 @@ T3_GENERATED_SUBTYPES = {"register-machine-sim", "vigenere-decrypt"}
 # ── Main build ───────────────────────────────────────────────────────────────
 
 def build_dataset():
-    random.seed(42)  # Reproducible
-
     banks = load_banks()
     existing_t2 = load_existing_t2()
     existing_master = load_existing_master()
@@ -1306,8 +1327,11 @@ def build_dataset():
     existing_ids = set()
     for q in all_questions:
         if q["id"] in existing_ids:
-            # Generate a new unique ID
-            q["id"] = make_id(q["section"], q["tier"], q.get("subtype", "q"))
+            # Generate a new unique ID: the first free number for its prefix
+            n = 0
+            while make_id(q["section"], q["tier"], q.get("subtype", "q"), n) in existing_ids:
+                n += 1
+            q["id"] = make_id(q["section"], q["tier"], q.get("subtype", "q"), n)
         existing_ids.add(q["id"])
 
     # ── Validation ───────────────────────────────────────────────────────
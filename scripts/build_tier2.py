@@ -6,8 +6,8 @@ Generates 105 questions (7 sections x 3 subtypes x 5 each) with SHA-256 hashed
 answers. These are scaled-down versions of the Tier 3 computational questions,
 small enough that a careful human could potentially solve them.
 
-Uses mulberry32 PRNG for all seed-dependent computations to guarantee
-parity with the TypeScript client.
+Uses mulberry32 PRNG (scripts/scca_rng.py) for all seed-dependent computations
+to guarantee parity with the TypeScript client.
 
 Outputs:
   - lib/data/tier2_questions.json
@@ -20,49 +20,21 @@ import os
 import sys
 import numpy as np
 
-
-# ============================================================================
-# Mulberry32 PRNG -- must match TypeScript implementation exactly
-# ============================================================================
-
-def mulberry32(seed):
-    state = [seed & 0xFFFFFFFF]
-
-    def imul(a, b):
-        """Emulate JavaScript Math.imul (32-bit integer multiply)."""
-        return ((a & 0xFFFFFFFF) * (b & 0xFFFFFFFF)) & 0xFFFFFFFF
-
-    def next_float():
-        state[0] = (state[0] + 0x6D2B79F5) & 0xFFFFFFFF
-        t = state[0]
-        t = imul(t ^ (t >> 15), t | 1)
-        t = (t ^ ((t + imul(t ^ (t >> 7), t | 61)) & 0xFFFFFFFF)) & 0xFFFFFFFF
-        return ((t ^ (t >> 14)) & 0xFFFFFFFF) / 4294967296
-
-    return next_float
-
-
-def mulberry32_int(rng, min_val, max_val):
-    """Random integer in [min_val, max_val] inclusive."""
-    return math.floor(rng() * (max_val - min_val + 1)) + min_val
-
-
-def mulberry32_choice(rng, arr):
-    """Pick random element from array."""
-    return arr[math.floor(rng() * len(arr))]
-
-
-def mulberry32_choices(rng, arr, k):
-    """Pick k elements with replacement."""
-    return [mulberry32_choice(rng, arr) for _ in range(k)]
-
-
-def mulberry32_hex_char(rng):
-    return "0123456789abcdef"[math.floor(rng() * 16)]
-
-
-def mulberry32_hex_string(rng, length):
-    return "".join(mulberry32_hex_char(rng) for _ in range(length))
+from scca_aes import shift_rows
+from scca_bitops import compile_chain
+from scca_needles import first_verified, palindromic_windows, verify_block_max, verify_palindrome_window
+from scca_numtheory import prime_shift_offset
+from scca_signal import block_log_likelihood_ratio, rank_blocks
+from scca_spatial import nearest_neighbour_tour
+from scca_rng import (
+    mulberry32,
+    mulberry32_choice,
+    mulberry32_choices,
+    mulberry32_hex_string,
+    mulberry32_int,
+    mulberry32_normals,
+    mulberry32_shuffle,
+)
 
 
 # ============================================================================
@@ -92,21 +64,6 @@ def normalize_and_hash(answer, normalization, decimal_places=None):
 # Helpers
 # ============================================================================
 
-def is_prime(n):
-    if n <= 1:
-        return False
-    if n <= 3:
-        return True
-    if n % 2 == 0 or n % 3 == 0:
-        return False
-    i = 5
-    while i * i <= n:
-        if n % i == 0 or n % (i + 2) == 0:
-            return False
-        i += 6
-    return True
-
-
 def make_question(qid, section, subtype, tier, prompt, answer, normalization,
                   decimal_places=None, input_type="text", options=None,
                   display=None, client_seed=None, interactive_config=None):
@@ -317,12 +274,7 @@ def build_recursive_exec(questions):
     for i in range(5):
         start_n, end_n = shift_ranges[i]
         arr = [0, 1, 2, 3, 4]
-        for n in range(start_n, end_n + 1):
-            if is_prime(n):
-                arr = arr[1:] + arr[:1]
-            else:
-                arr = arr[-1:] + arr[:-1]
-        ans = str(arr[0])
+        ans = str(arr[prime_shift_offset(start_n, end_n, len(arr))])
         questions.append(make_question(
             f"t2_recursive-exec_{len(questions)}", "recursive-exec", "array_shift_small", 2,
             f"Array A = [0, 1, 2, 3, 4]. For each N from {start_n} to {end_n}: "
@@ -337,25 +289,61 @@ def build_recursive_exec(questions):
 # Section 4: Micro Pattern (15 questions: 3 subtypes x 5 each)
 # ============================================================================
 
+def hex_palindrome_haystack(seed):
+    rng = mulberry32(seed)
+    num_chars = 200
+    chars = list(mulberry32_hex_string(rng, num_chars))
+    plant_start = mulberry32_int(rng, 10, num_chars - 9)
+    half = mulberry32_hex_string(rng, 4)
+    palindrome = half + half[::-1]
+    for j in range(8):
+        chars[plant_start + j] = palindrome[j]
+    hex_string = "".join(chars)
+    return {
+        "hex_string": hex_string,
+        "nibbles": np.array([int(c, 16) for c in hex_string], dtype=np.uint8),
+        "start": plant_start,
+    }
+
+
+def verify_hex_palindrome(hay):
+    return verify_palindrome_window(hay["nibbles"], 8, hay["start"])
+
+
+VARIANCE_DRIFT_BLOCK = 5
+
+
+def variance_drift_haystack(seed):
+    rng = mulberry32(seed)
+    num_floats = 100
+    plant_start = mulberry32_int(rng, 10, num_floats - VARIANCE_DRIFT_BLOCK - 10)
+    floats = mulberry32_normals(rng, num_floats)
+    for j in range(plant_start, plant_start + VARIANCE_DRIFT_BLOCK):
+        floats[j] += 1.0
+    # Rank every block by the likelihood ratio for a +1 mean shift, using
+    # the values as displayed (4 decimal places)
+    shown = np.round(np.array(floats), 4)
+    scores = block_log_likelihood_ratio(shown, VARIANCE_DRIFT_BLOCK, mean=1.0, std=1.0)
+    return {"floats": floats, "start": plant_start, "scores": scores}
+
+
+def verify_variance_drift(hay):
+    return verify_block_max(hay["scores"], hay["start"])
+
+
 def build_micro_pattern(questions):
 
     # Subtype 1: hex_palindrome_small (5 questions)
     for i in range(5):
-        seed = 8300 + i
-        rng = mulberry32(seed)
-        num_chars = 200
-        chars = list(mulberry32_hex_string(rng, num_chars))
-        plant_start = mulberry32_int(rng, 10, num_chars - 9)
-        half = mulberry32_hex_string(rng, 4)
-        palindrome = half + half[::-1]
-        for j in range(8):
-            chars[plant_start + j] = palindrome[j]
-        hex_string = "".join(chars)
+        seed, hay = first_verified(8300 + i, hex_palindrome_haystack, verify_hex_palindrome)
+        hex_string = hay["hex_string"]
         display_lines = []
         for start in range(0, len(hex_string), 40):
             display_lines.append(f"  [{start:3d}] {hex_string[start:start+40]}")
         display_str = "\n".join(display_lines)
-        ans = str(plant_start)
+        # Read the answer back from the haystack, not from the planting code
+        (start,) = palindromic_windows(hay["nibbles"], 8)
+        ans = str(start)
         questions.append(make_question(
             f"t2_micro-pattern_{len(questions)}", "micro-pattern", "hex_palindrome_small", 2,
             f"200 hex characters are shown below. One 8-character substring is a perfect palindrome "
@@ -365,28 +353,16 @@ def build_micro_pattern(questions):
 
     # Subtype 2: variance_drift_small (5 questions)
     for i in range(5):
-        seed = 8400 + i
-        rng = mulberry32(seed)
-        num_floats = 100
-        block_size = 5
-        plant_start = mulberry32_int(rng, 10, num_floats - block_size - 10)
-        floats = []
-        for _ in range(num_floats // 2 + 1):
-            u1 = max(rng(), 1e-10)
-            u2 = rng()
-            z0 = math.sqrt(-2 * math.log(u1)) * math.cos(2 * math.pi * u2)
-            z1 = math.sqrt(-2 * math.log(u1)) * math.sin(2 * math.pi * u2)
-            floats.append(z0)
-            floats.append(z1)
-        floats = floats[:num_floats]
-        for j in range(plant_start, plant_start + block_size):
-            floats[j] += 1.0
+        seed, hay = first_verified(8400 + i, variance_drift_haystack, verify_variance_drift)
+        floats = hay["floats"]
+        num_floats, block_size = len(floats), VARIANCE_DRIFT_BLOCK
         data_lines = []
         for f_i in range(0, num_floats, 5):
             row_vals = [f"{floats[f_i + k]:+.4f}" for k in range(min(5, num_floats - f_i))]
             data_lines.append(f"  [{f_i:3d}] " + "  ".join(row_vals))
         data_str = "\n".join(data_lines)
-        ans = str(plant_start)
+        # The planted block is the unique maximum of the scan
+        ans = str(rank_blocks(hay["scores"], block_size)["index"])
         questions.append(make_question(
             f"t2_micro-pattern_{len(questions)}", "micro-pattern", "variance_drift_small", 2,
             f"100 values drawn from N(0,1) are shown below. One block of {block_size} consecutive values "
@@ -405,9 +381,7 @@ def build_micro_pattern(questions):
             strings.append(mulberry32_hex_string(rng, 8))
         plant_idx = mulberry32_int(rng, 0, num_strings - 1)
         target_digits = [15, 15, 10, 8, 5, 3, 2, 2]
-        for j in range(7, 0, -1):
-            k = mulberry32_int(rng, 0, j)
-            target_digits[j], target_digits[k] = target_digits[k], target_digits[j]
+        mulberry32_shuffle(rng, target_digits)
         planted_str = "".join("0123456789abcdef"[d] for d in target_digits)
         strings[plant_idx] = planted_str
         for s_i in range(num_strings):
@@ -436,6 +410,22 @@ def build_micro_pattern(questions):
 # Section 5: Attentional (15 questions: 3 subtypes x 5 each)
 # ============================================================================
 
+def trajectory_small_haystack(seed):
+    rng = mulberry32(seed)
+    nodes = []
+    for node_id in range(8):
+        x = round(rng() * 20, 1)
+        y = round(rng() * 20, 1)
+        nodes.append((node_id, x, y))
+    # Coordinates are shown exactly, so only exact distance ties are ambiguous
+    walk = nearest_neighbour_tour([(x, y) for _, x, y in nodes], start=0, steps=4, tie_tol=1e-9)
+    return {"nodes": nodes, "tour": walk["tour"], "ties": walk["ties"]}
+
+
+def verify_trajectory_small(hay):
+    return [f"step {step}: node {chosen} tied with {others}" for step, chosen, others in hay["ties"]]
+
+
 def build_attentional(questions):
 
     # Subtype 1: cipher_small (5 questions)
@@ -446,9 +436,7 @@ def build_attentional(questions):
         used_letters = alpha[:8]
         plaintext = "".join(mulberry32_choices(rng, used_letters, 8))
         key_letters = used_letters[:]
-        for j in range(7, 0, -1):
-            k = mulberry32_int(rng, 0, j)
-            key_letters[j], key_letters[k] = key_letters[k], key_letters[j]
+        mulberry32_shuffle(rng, key_letters)
         sub_map = {used_letters[j]: key_letters[j] for j in range(8)}
         ciphertext = "".join(sub_map[c] for c in plaintext)
         key_lines = [f"  {used_letters[j]} -> {key_letters[j]}" for j in range(8)]
@@ -464,29 +452,8 @@ def build_attentional(questions):
 
     # Subtype 2: trajectory_small (5 questions)
     for i in range(5):
-        seed = 8700 + i
-        rng = mulberry32(seed)
-        nodes = []
-        for node_id in range(8):
-            x = round(rng() * 20, 1)
-            y = round(rng() * 20, 1)
-            nodes.append((node_id, x, y))
-        visited = [0]
-        current = 0
-        remaining = set(range(1, 8))
-        for step in range(4):
-            best_dist = float("inf")
-            best_node = -1
-            cx, cy = nodes[current][1], nodes[current][2]
-            for node_id in remaining:
-                nx, ny = nodes[node_id][1], nodes[node_id][2]
-                d = math.sqrt((cx - nx) ** 2 + (cy - ny) ** 2)
-                if d < best_dist:
-                    best_dist = d
-                    best_node = node_id
-            visited.append(best_node)
-            remaining.remove(best_node)
-            current = best_node
+        seed, hay = first_verified(8700 + i, trajectory_small_haystack, verify_trajectory_small)
+        nodes, visited = hay["nodes"], hay["tour"]
         data_lines = []
         for node_id, x, y in nodes:
             data_lines.append(f"  Node {node_id}: ({x:.1f}, {y:.1f})")
@@ -692,7 +659,6 @@ def build_crypto_bitwise(questions):
         seed = 9000 + i
         rng = mulberry32(seed)
         val = mulberry32_int(rng, 0, 0xFFFF)
-        mask = 0xFFFF
         ops = []
         op_names = ["SHL", "SHR", "XOR"]
         for _ in range(3):
@@ -703,18 +669,15 @@ def build_crypto_bitwise(questions):
             else:
                 shift_amt = mulberry32_int(rng, 1, 8)
                 ops.append((op, shift_amt))
-        current = val
         op_lines = []
         for op, operand in ops:
             if op == "SHL":
-                current = (current << operand) & mask
                 op_lines.append(f"  {op} {operand} (shift left by {operand} bits, keep lower 16 bits)")
             elif op == "SHR":
-                current = (current >> operand) & mask
                 op_lines.append(f"  {op} {operand} (shift right by {operand} bits)")
             elif op == "XOR":
-                current = (current ^ operand) & mask
                 op_lines.append(f"  XOR 0x{operand:04X} (bitwise XOR with 0x{operand:04X})")
+        current = compile_chain(16, ops)(val)
         ops_str = "\n".join(op_lines)
         ans = f"{current:04X}"
         questions.append(make_question(
@@ -730,10 +693,7 @@ def build_crypto_bitwise(questions):
         seed = 9100 + i
         rng = mulberry32(seed)
         matrix = [mulberry32_int(rng, 0, 255) for _ in range(16)]
-        shifted = [0] * 16
-        for r in range(4):
-            for c in range(4):
-                shifted[r + 4 * c] = matrix[r + 4 * ((c + r) % 4)]
+        shifted = shift_rows(matrix)[0].tolist()
         matrix_lines = []
         for r in range(4):
             row_vals = [f"{matrix[r + 4*c]:02X}" for c in range(4)]
@@ -18,6 +18,15 @@ Applies targeted, auditable edits to lib/data/scca_master_dataset.json:
 4. Switches free-response subtypes whose every answer is a plain integer from
    normalization "exact" to "numeric-rounded" (decimalPlaces 0), so "42,201",
    "+5" or "5.0" grade correctly.
+5. Fixes deep_array_shift: the builder counted N-1 right shifts for the
+   composites but N=1 (neither prime nor composite) shifts right as well, so
+   every answer was one left rotation off. Recomputes the answer as
+   (2*pi(N) - N) mod 5 (scripts/scca_numtheory.py).
+6. Re-seeds variance_drift_small: in four of five items a different block
+   had a larger shifted-mean likelihood ratio than the planted one, so the
+   sliding-window method gave a different answer. Prompt, clientSeed and
+   answer are taken from build_tier2.py, which now re-seeds until the
+   planted block is the unique maximum.
 
 Hashes are NOT computed here. There is exactly one definition of the answer
 hash (lib/engine/canonicalize.ts via lib/banks/shared.ts); this script edits
@@ -32,6 +41,11 @@ import subprocess
 import sys
 from pathlib import Path
 
+from build_tier2 import build_micro_pattern
+from scca_needles import RESEED_STRIDE
+from scca_numtheory import lcg_jump, prime_shift_offset
+from scca_seeds import verify_distinct
+
 ROOT = Path(__file__).resolve().parent.parent
 PATH = ROOT / "lib" / "data" / "scca_master_dataset.json"
 
@@ -54,11 +68,9 @@ LCG_STEPS = 1_000_000
 
 
 def lcg_state(seed: int) -> str:
-    # Closed form: X_n = A^n X_0 + C (A^n - 1)/(A - 1) mod M.
-    # (A-1) is even so we cannot divide mod 2^128; iterate instead (1e6 steps is fast).
-    x = seed
-    for _ in range(LCG_STEPS):
-        x = (LCG_A * x + LCG_C) % LCG_M
+    # The closed form C (A^n - 1)/(A - 1) needs (A-1)^-1, which does not exist
+    # mod 2^128 for the odd multiplier; jump ahead by squaring the affine map.
+    x = lcg_jump(seed, LCG_STEPS, LCG_A, LCG_C, LCG_M)
     return f"{x:032X}"
 
 
@@ -103,8 +115,9 @@ def main() -> None:
                 q["prompt"] = new
                 reworded += 1
 
-    lcg_answers = {q["_verifiedAnswer"] for q in kept if q["subtype"] == "massive_lcg"}
-    assert len(lcg_answers) == 10, "massive_lcg answers must be distinct"
+    lcg_answers = [q["_verifiedAnswer"] for q in kept if q["subtype"] == "massive_lcg"]
+    problems = verify_distinct(lcg_answers, "massive_lcg answers")
+    assert len(lcg_answers) == 10 and not problems, problems or "expected 10 massive_lcg items"
 
     # 4. Integer-valued free-response subtypes -> numeric-rounded (dp 0).
     by_subtype: dict[str, list[dict]] = {}
@@ -122,12 +135,40 @@ def main() -> None:
             q["decimalPlaces"] = 0
             to_numeric += 1
 
+    # 5. deep_array_shift: N=1 shifts right too.
+    shift_fixed = 0
+    for q in kept:
+        if q["subtype"] == "deep_array_shift":
+            m = re.search(r"For N=1 to (\d+):", q["prompt"])
+            assert m, q["id"]
+            ans = str(prime_shift_offset(1, int(m.group(1)), 5))
+            if q["_verifiedAnswer"] != ans:
+                q["_verifiedAnswer"] = ans
+                shift_fixed += 1
+
+    # 6. variance_drift_small: rebuilt items, matched on their original seed.
+    rebuilt = []
+    build_micro_pattern(rebuilt)
+    by_seed = {
+        r["clientSeed"] % RESEED_STRIDE: r for r in rebuilt if r["subtype"] == "variance_drift_small"
+    }
+    reseeded = 0
+    for q in kept:
+        if q["subtype"] == "variance_drift_small":
+            r = by_seed[q["clientSeed"] % RESEED_STRIDE]
+            if q["clientSeed"] != r["clientSeed"]:
+                q["prompt"] = r["prompt"]
+                q["clientSeed"] = r["clientSeed"]
+                q["_verifiedAnswer"] = r["_verifiedAnswer"]
+                reseeded += 1
+
     json.dump(kept, open(PATH, "w"), indent=2, ensure_ascii=False)
     with open(PATH, "a") as f:
         f.write("\n")
     print(
         f"items: {before} -> {len(kept)} (removed {removed}); lcg answers fixed: {lcg_fixed}; "
-        f"reworded: {reworded}; exact->numeric-rounded: {to_numeric}"
+        f"reworded: {reworded}; exact->numeric-rounded: {to_numeric}; "
+        f"deep_array_shift answers fixed: {shift_fixed}; variance_drift_small re-seeded: {reseeded}"
     )
 
     # Recompute every hash with the canonical TS definition.
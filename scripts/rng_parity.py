@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Mulberry32 Python/TypeScript parity corpus and differential harness.
+
+lib/data/mulberry32_parity.json (5 seeds x 10 draws) is the fixture the
+vitest suite has always checked. This is the large one: 10,000 seeds x 1,000
+draws, covering the edge seeds (0, +-1, 2^31-1, -2^31, 2^32-1, 2^32, values
+up to +-(2^53-1)) plus pseudo-random seeds at every magnitude.
+
+  - lib/data/mulberry32_parity_corpus.json (committed): seed list, shape and
+    the SHA-256 of the corpus. lib/__tests__/banks.test.ts recomputes that
+    digest from lib/engine/rng.ts.
+  - lib/data/mulberry32_parity_corpus.bin (built, not committed; 40 MB):
+    the raw uint32 outputs, little-endian, seed-major [seeds, draws]. Built
+    from the scalar reference port and checked against the digest.
+
+The harness then checks every Python RNG path in scripts/scca_rng.py against
+the corpus (scalar stream, block, chunked draws(), draw_at(), skip(), and
+Mulberry32Lanes lane by lane), replays the derived block and lane helpers
+(ints, choices, shuffles, normals, hex) against their scalar versions on
+the first DERIVED_SEEDS seeds, and checks the corpus against one long-lived
+Node process running lib/engine/rng.ts (scripts/rng_parity_worker.ts).
+
+Usage:
+  python3 scripts/rng_parity.py              # check (builds the .bin if missing)
+  python3 scripts/rng_parity.py --write      # regenerate the seed list + digest
+  python3 scripts/rng_parity.py --no-node    # skip the Node differential
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from scca_rng import (
+    draw_at_u32,
+    draws_u32,
+    mix_u32,
+    mulberry32,
+    mulberry32_block_u32,
+    mulberry32_choices,
+    mulberry32_choices_block,
+    mulberry32_hex_block,
+    mulberry32_hex_string,
+    mulberry32_int,
+    mulberry32_int_block,
+    mulberry32_normals,
+    mulberry32_normals_block,
+    mulberry32_randint,
+    mulberry32_randint_block,
+    mulberry32_randint_lanes,
+    mulberry32_shuffle,
+    mulberry32_shuffle_block,
+    mulberry32_shuffle_lanes,
+    Mulberry32Lanes,
+    MULBERRY32_INCREMENT,
+    U32_MASK,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+MANIFEST_PATH = ROOT / "lib" / "data" / "mulberry32_parity_corpus.json"
+CORPUS_PATH = ROOT / "lib" / "data" / "mulberry32_parity_corpus.bin"
+
+NUM_SEEDS = 10_000
+NUM_DRAWS = 1_000
+SEED_LIST_SEED = 0x5CCA  # random.Random seed for the non-edge seeds
+DERIVED_SEEDS = 500  # seeds the derived helpers are replayed on
+
+# JS numbers are exact up to 2^53 - 1, and rng.ts reduces seeds with `| 0`.
+MAX_SAFE = (1 << 53) - 1
+
+EDGE_SEEDS = [
+    0, 1, -1, 2, -2,
+    (1 << 31) - 1, 1 << 31, -(1 << 31), -(1 << 31) - 1,
+    (1 << 32) - 1, 1 << 32, (1 << 32) + 1, -(1 << 32), -(1 << 32) - 1,
+    MULBERRY32_INCREMENT, -MULBERRY32_INCREMENT, U32_MASK - MULBERRY32_INCREMENT,
+    (1 << 40) + 12345, MAX_SAFE, -MAX_SAFE,
+    12345, 4000, 99999,  # the seeds in mulberry32_parity.json
+]
+
+
+# ============================================================================
+# Corpus
+# ============================================================================
+
+def make_seeds():
+    """EDGE_SEEDS, then pseudo-random seeds spread across 2^1 .. 2^53."""
+    r = random.Random(SEED_LIST_SEED)
+    seeds = list(EDGE_SEEDS)
+    seen = set(seeds)
+    while len(seeds) < NUM_SEEDS:
+        bits = r.randint(1, 53)
+        s = r.randrange(1 << bits) if bits < 53 else r.randint(0, MAX_SAFE)
+        if r.random() < 0.5:
+            s = -s
+        if s not in seen:
+            seen.add(s)
+            seeds.append(s)
+    return seeds
+
+
+def reference_draws(seed, n):
+    """The scalar reference port, step by step, as uint32."""
+    state = seed & U32_MASK
+    out = []
+    for _ in range(n):
+        state = (state + MULBERRY32_INCREMENT) & U32_MASK
+        out.append(mix_u32(state))
+    return out
+
+
+def build_corpus(seeds, draws):
+    corpus = np.empty((len(seeds), draws), dtype="<u4")
+    for row, seed in enumerate(seeds):
+        corpus[row] = reference_draws(seed, draws)
+    return corpus
+
+
+def digest(corpus):
+    return hashlib.sha256(np.ascontiguousarray(corpus, dtype="<u4").tobytes()).hexdigest()
+
+
+def write_manifest(seeds, draws, sha256):
+    manifest = {
+        "description": "mulberry32 parity corpus; see scripts/rng_parity.py",
+        "file": CORPUS_PATH.name,
+        "dtype": "uint32-le",
+        "layout": "seed-major [seeds, draws]; draw j of seed i is the (j+1)-th rng() value",
+        "draws": draws,
+        "sha256": sha256,
+        "seeds": seeds,
+    }
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+
+def load_corpus(manifest):
+    """Load the .bin, rebuilding it from the scalar reference if missing or stale."""
+    shape = (len(manifest["seeds"]), manifest["draws"])
+    if CORPUS_PATH.exists():
+        corpus = np.fromfile(CORPUS_PATH, dtype="<u4")
+        if corpus.size == shape[0] * shape[1] and digest(corpus) == manifest["sha256"]:
+            return corpus.reshape(shape)
+        print(f"  {CORPUS_PATH.name} does not match the manifest digest; rebuilding")
+    t0 = time.time()
+    corpus = build_corpus(manifest["seeds"], manifest["draws"])
+    got = digest(corpus)
+    if got != manifest["sha256"]:
+        sys.exit(f"FAILED: scalar reference digest {got} != manifest {manifest['sha256']}")
+    corpus.tofile(CORPUS_PATH)
+    print(f"  built {CORPUS_PATH.name} from the scalar reference in {time.time() - t0:.1f}s")
+    return corpus
+
+
+# ============================================================================
+# Python paths
+# ============================================================================
+
+def check_python_paths(seeds, corpus):
+    errors = []
+    n = corpus.shape[1]
+    r = random.Random(1)
+
+    def expect(name, seed, got, want):
+        if not np.array_equal(np.asarray(got, dtype=np.uint32), want):
+            errors.append(f"{name}: seed {seed} diverges")
+
+    for row, seed in enumerate(seeds):
+        want = corpus[row]
+
+        expect("block", seed, mulberry32_block_u32(seed, n), want)
+
+        cuts = sorted({0, n, *(r.randrange(n) for _ in range(3))})
+        chunks = [draws_u32(seed, a, b) for a, b in zip(cuts, cuts[1:])]
+        expect("draws (chunked)", seed, np.concatenate(chunks), want)
+
+        ks = [0, n - 1, r.randrange(n)]
+        expect("draw_at", seed, [draw_at_u32(seed, k) for k in ks], want[ks])
+
+        # Scalar stream, block() and skip() interleaved on one stream object.
+        rng = mulberry32(seed)
+        a, b = r.randrange(1, n // 2), r.randrange(n // 2, n - 1)
+        head = [round(rng() * 4294967296) for _ in range(a)]
+        mid = rng.block_u32(b - a)
+        rng.skip(1)
+        tail = [round(rng() * 4294967296) for _ in range(n - b - 1)]
+        expect("stream", seed, head + mid.tolist() + [want[b]] + tail, want)
+
+    # Lane-parallel streams: lane i against row i, through block() chunks
+    # with a single lanes() draw at the end of each chunk.
+    lanes = Mulberry32Lanes(seeds)
+    cuts = sorted({0, n, *(r.randrange(1, n) for _ in range(4))})
+    parts = []
+    for a, b in zip(cuts, cuts[1:]):
+        parts.append(lanes.block_u32(b - a - 1))
+        parts.append(np.round(lanes()[:, None] * 4294967296).astype(np.uint32))
+    lane_rows = np.concatenate(parts, axis=1)
+    for row in np.flatnonzero((lane_rows != corpus).any(axis=1)):
+        errors.append(f"Mulberry32Lanes: lane {row} (seed {seeds[row]}) diverges")
+
+    # Derived helpers: every block path against its scalar replay on a sample
+    # of seeds. Each pair must also leave the two streams at the same
+    # position, which the final draw checks.
+    sample = seeds[:DERIVED_SEEDS]
+    letters = list("abcdefghijklmnopqrstuvwxyz0123456789")
+    n_norm = n - 1  # odd, so the last Box-Muller pair is truncated
+    for seed in sample:
+        s, v = mulberry32(seed), mulberry32(seed)
+
+        def same(name, got, want):
+            if got != want:
+                errors.append(f"{name}: seed {seed} diverges")
+
+        same("mulberry32_int_block", mulberry32_int_block(v, -7, 300, n).tolist(),
+             [mulberry32_int(s, -7, 300) for _ in range(n)])
+        same("mulberry32_randint_block", mulberry32_randint_block(v, 3, 1000, n).tolist(),
+             [mulberry32_randint(s, 3, 1000) for _ in range(n)])
+        same("mulberry32_hex_block", mulberry32_hex_block(v, n), mulberry32_hex_string(s, n))
+        same("mulberry32_choices_block", mulberry32_choices_block(v, letters, n),
+             mulberry32_choices(s, letters, n))
+        want, got = list(range(n // 4)), list(range(n // 4))
+        mulberry32_shuffle(s, want)
+        mulberry32_shuffle_block(v, got)
+        same("mulberry32_shuffle_block", got, want)
+        same("mulberry32_normals_block", mulberry32_normals_block(v, n_norm).tolist(),
+             mulberry32_normals(s, n_norm))
+        same("derived helpers (stream position)", v(), s())
+
+    # Lane helpers against the same scalar helpers, one lane per sample seed.
+    lanes = Mulberry32Lanes(sample)
+    got = mulberry32_randint_lanes(lanes, 3, 1000, n)
+    table = np.tile(np.arange(n // 4), (len(sample), 1))
+    mulberry32_shuffle_lanes(lanes, table)
+    for row, seed in enumerate(sample):
+        s = mulberry32(seed)
+        if got[row].tolist() != [mulberry32_randint(s, 3, 1000) for _ in range(n)]:
+            errors.append(f"mulberry32_randint_lanes: seed {seed} diverges")
+        want = list(range(n // 4))
+        mulberry32_shuffle(s, want)
+        if table[row].tolist() != want:
+            errors.append(f"mulberry32_shuffle_lanes: seed {seed} diverges")
+
+    return errors
+
+
+# ============================================================================
+# Node differential
+# ============================================================================
+
+def check_node(seeds, corpus):
+    """Stream every seed through one Node process running lib/engine/rng.ts."""
+    errors = []
+    n = corpus.shape[1]
+    proc = subprocess.Popen(
+        ["npx", "tsx", "scripts/rng_parity_worker.ts"],
+        cwd=ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        for row, seed in enumerate(seeds):
+            proc.stdin.write(f"{seed} {n}\n")
+            proc.stdin.flush()
+            line = proc.stdout.readline()
+            if not line:
+                errors.append("node worker exited early")
+                break
+            got = np.frombuffer(bytes.fromhex(line.strip()), dtype="<u4")
+            if not np.array_equal(got, corpus[row]):
+                errors.append(f"node: seed {seed} diverges")
+    finally:
+        proc.stdin.close()
+        proc.wait()
+    return errors
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--write", action="store_true", help="regenerate the seed list, corpus and digest")
+    parser.add_argument("--no-node", action="store_true", help="skip the Node differential")
+    args = parser.parse_args()
+
+    if args.write:
+        seeds = make_seeds()
+        t0 = time.time()
+        corpus = build_corpus(seeds, NUM_DRAWS)
+        corpus.tofile(CORPUS_PATH)
+        write_manifest(seeds, NUM_DRAWS, digest(corpus))
+        print(f"Wrote {MANIFEST_PATH} and {CORPUS_PATH} ({len(seeds)} x {NUM_DRAWS}, {time.time() - t0:.1f}s)")
+
+    manifest = json.load(open(MANIFEST_PATH))
+    seeds = manifest["seeds"]
+    print(f"Checking {len(seeds)} seeds x {manifest['draws']} draws (sha256 {manifest['sha256'][:16]}...)")
+    corpus = load_corpus(manifest)
+
+    t0 = time.time()
+    errors = check_python_paths(seeds, corpus)
+    print(f"  Python paths: {len(errors)} errors ({time.time() - t0:.1f}s)")
+
+    if not args.no_node:
+        t0 = time.time()
+        node_errors = check_node(seeds, corpus)
+        print(f"  Node (lib/engine/rng.ts): {len(node_errors)} errors ({time.time() - t0:.1f}s)")
+        errors += node_errors
+
+    if errors:
+        print(f"\nFAILED with {len(errors)} errors:")
+        for e in errors[:50]:
+            print(f"  - {e}")
+        sys.exit(1)
+    print("All RNG paths match the parity corpus")
+
+
+if __name__ == "__main__":
+    main()
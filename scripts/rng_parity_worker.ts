@@ -0,0 +1,22 @@
+/**
+ * Long-lived mulberry32 worker for the Python parity harness.
+ *
+ * Reads one request per line on stdin, "<seed> <count>", and answers each
+ * with one line: the first <count> raw uint32 outputs of mulberry32(seed)
+ * from lib/engine/rng.ts, little-endian, hex-encoded.
+ *
+ *   npx tsx scripts/rng_parity_worker.ts   (spawned by scripts/rng_parity.py)
+ */
+import { createInterface } from "readline";
+import { mulberry32 } from "../lib/engine/rng";
+
+const lines = createInterface({ input: process.stdin });
+
+lines.on("line", (line) => {
+  const [seedStr, countStr] = line.trim().split(/\s+/);
+  const rng = mulberry32(Number(seedStr));
+  const out = new Uint32Array(Number(countStr));
+  // rng() is u32 / 2^32, so multiplying back is exact.
+  for (let i = 0; i < out.length; i++) out[i] = rng() * 4294967296;
+  process.stdout.write(Buffer.from(out.buffer).toString("hex") + "\n");
+});
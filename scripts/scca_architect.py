@@ -3,8 +3,8 @@
 SCCA Master Dataset Generator (Deterministic PRNG Architecture)
 
 Generates 350 questions (7 sections x 5 subtypes x 10 each) with SHA-256 hashed
-answers. Uses mulberry32 PRNG for all seed-dependent computations to guarantee
-parity with the TypeScript client.
+answers. Uses mulberry32 PRNG (scripts/scca_rng.py) for all seed-dependent
+computations to guarantee parity with the TypeScript client.
 
 Outputs:
   - lib/data/scca_master_dataset.json
@@ -19,49 +19,41 @@ import sys
 import numpy as np
 from scipy.special import gamma
 
-
-# ============================================================================
-# Mulberry32 PRNG -- must match TypeScript implementation exactly
-# ============================================================================
-
-def mulberry32(seed):
-    state = [seed & 0xFFFFFFFF]
-
-    def imul(a, b):
-        """Emulate JavaScript Math.imul (32-bit integer multiply)."""
-        return ((a & 0xFFFFFFFF) * (b & 0xFFFFFFFF)) & 0xFFFFFFFF
-
-    def next_float():
-        state[0] = (state[0] + 0x6D2B79F5) & 0xFFFFFFFF
-        t = state[0]
-        t = imul(t ^ (t >> 15), t | 1)
-        t = (t ^ ((t + imul(t ^ (t >> 7), t | 61)) & 0xFFFFFFFF)) & 0xFFFFFFFF
-        return ((t ^ (t >> 14)) & 0xFFFFFFFF) / 4294967296
-
-    return next_float
-
-
-def mulberry32_int(rng, min_val, max_val):
-    """Random integer in [min_val, max_val] inclusive."""
-    return math.floor(rng() * (max_val - min_val + 1)) + min_val
-
-
-def mulberry32_choice(rng, arr):
-    """Pick random element from array."""
-    return arr[math.floor(rng() * len(arr))]
-
-
-def mulberry32_choices(rng, arr, k):
-    """Pick k elements with replacement."""
-    return [mulberry32_choice(rng, arr) for _ in range(k)]
-
-
-def mulberry32_hex_char(rng):
-    return "0123456789abcdef"[math.floor(rng() * 16)]
-
-
-def mulberry32_hex_string(rng, length):
-    return "".join(mulberry32_hex_char(rng) for _ in range(length))
+from scca_aes import shift_rows
+from scca_bayes import gmm_em, log_floor, viterbi
+from scca_bitops import compile_chain
+from scca_needles import (
+    first_verified,
+    palindromic_windows,
+    verify_duplicate_rows,
+    verify_palindrome_window,
+    verify_prefix_group,
+    verify_single_value,
+)
+from scca_nonce import nonce_search, shared_pool
+from scca_numtheory import (
+    ackermann_mod,
+    lcg_jump,
+    linear_recurrence,
+    next_prime,
+    prime_shift_offset,
+    tower_mod,
+)
+from scca_signal import wave_zero_search
+from scca_spatial import nearest_neighbour_tour
+from scca_rng import (
+    Mulberry32Lanes,
+    letter_strings,
+    mulberry32,
+    mulberry32_choice,
+    mulberry32_hex_block,
+    mulberry32_int,
+    mulberry32_int_block,
+    mulberry32_int_lanes,
+    mulberry32_nibble_block,
+    mulberry32_normals_block,
+    mulberry32_shuffle_lanes,
+)
 
 
 # ============================================================================
@@ -91,21 +83,6 @@ def normalize_and_hash(answer, normalization, decimal_places=None):
 # Helpers
 # ============================================================================
 
-def is_prime(n):
-    if n <= 1:
-        return False
-    if n <= 3:
-        return True
-    if n % 2 == 0 or n % 3 == 0:
-        return False
-    i = 5
-    while i * i <= n:
-        if n % i == 0 or n % (i + 2) == 0:
-            return False
-        i += 6
-    return True
-
-
 def make_question(qid, section, subtype, prompt, answer, normalization,
                   decimal_places=None, input_type="text", options=None,
                   display=None, client_seed=None, interactive_config=None):
@@ -187,6 +164,105 @@ def build_sec1(subtype, i):
         )
 
 
+# ============================================================================
+# Planted-needle haystacks (checked by scca_needles before an item is kept)
+# ============================================================================
+
+def n_body_haystack(seed):
+    rng = mulberry32(seed)
+    # Generate 5000 velocity vectors (interleaved vx, vy draws)
+    velocities = (rng.block(10000) * 200 - 100).reshape(5000, 2)
+    # Pick 2 indices deterministically from PRNG stream to plant duplicates
+    idx1 = mulberry32_int(rng, 0, 2499)
+    idx2 = mulberry32_int(rng, 2500, 4999)
+    # Plant: make idx2's velocity identical to idx1's
+    velocities[idx2] = velocities[idx1]
+    return {"velocities": velocities, "pair": (idx1, idx2)}
+
+
+def verify_n_body(hay):
+    # The client shows 4 decimal places; only the planted pair may coincide there.
+    return verify_duplicate_rows(np.round(hay["velocities"], 4), hay["pair"])
+
+
+def hex_stream_haystack(seed):
+    rng = mulberry32(seed)
+    # Generate 1000 hex streams (each 64 chars)
+    streams = mulberry32_nibble_block(rng, 1000 * 64).reshape(1000, 64)
+    # Pick 3 indices deterministically, plant identical 8-char subsequence
+    indices = sorted([
+        mulberry32_int(rng, 0, 333),
+        mulberry32_int(rng, 334, 666),
+        mulberry32_int(rng, 667, 999),
+    ])
+    # Generate the shared subsequence and plant it at position 0
+    shared_sub = mulberry32_nibble_block(rng, 8)
+    streams[indices, :8] = shared_sub
+    return {"streams": streams, "indices": indices}
+
+
+def verify_hex_stream(hay):
+    return verify_prefix_group(hay["streams"], 8, hay["indices"])
+
+
+PRIME_MATRIX_VALUE = 251  # largest prime < 256
+HASH_ANOMALY_ZEROS = 5  # leading hex zeros of the planted string's SHA-256
+
+
+def prime_matrix_haystack(seed):
+    rng = mulberry32(seed)
+    # 100x100 hex matrix (each cell 2 hex chars). Background cells are
+    # uniform over 0-255 minus the planted value, which would otherwise
+    # appear ~39 times by chance.
+    matrix = mulberry32_int_block(rng, 0, 254, 10000)
+    matrix += matrix >= PRIME_MATRIX_VALUE
+    # Pick a cell deterministically and plant the prime there
+    px = mulberry32_int(rng, 0, 99)
+    py = mulberry32_int(rng, 0, 99)
+    matrix[py * 100 + px] = PRIME_MATRIX_VALUE
+    return {"matrix": matrix, "cell": (px, py)}
+
+
+def verify_prime_matrix(hay):
+    px, py = hay["cell"]
+    return verify_single_value(hay["matrix"], PRIME_MATRIX_VALUE, py * 100 + px)
+
+
+def palindrome_haystack(seed):
+    rng = mulberry32(seed)
+    num_chars = 50000
+    # Generate hex digits
+    chars = mulberry32_nibble_block(rng, num_chars)
+    # Pick a starting index for a 64-char palindrome
+    plant_start = mulberry32_int(rng, 100, num_chars - 65)
+    # Generate a 32-char half, mirror it to create palindrome
+    half = mulberry32_nibble_block(rng, 32)
+    chars[plant_start:plant_start + 64] = np.concatenate([half, half[::-1]])
+    return {"chars": chars, "start": plant_start}
+
+
+def verify_palindrome(hay):
+    return verify_palindrome_window(hay["chars"], 64, hay["start"])
+
+
+# NodeGraph shows coordinates to 2 decimals, so a displayed distance can be
+# off by up to 2 * 0.005 * sqrt(2) ~ 0.0142; closer calls are ambiguous.
+TRAJECTORY_DISPLAY_TOL = 0.015
+
+
+def trajectory_haystack(seed):
+    rng = mulberry32(seed)
+    # Generate 20 node positions in 2D (interleaved x, y draws)
+    nodes = rng.block(40).reshape(20, 2) * 100
+    # Nearest-neighbour traversal from node 0; only the first 5 nodes are asked
+    walk = nearest_neighbour_tour(nodes, start=0, steps=4, tie_tol=TRAJECTORY_DISPLAY_TOL)
+    return {"nodes": nodes, "tour": walk["tour"], "ties": walk["ties"]}
+
+
+def verify_tour_ties(hay):
+    return [f"step {step}: node {chosen} tied with {others}" for step, chosen, others in hay["ties"]]
+
+
 # ============================================================================
 # Section 2: Parallel State (ALL use mulberry32)
 # ============================================================================
@@ -195,18 +271,8 @@ def build_sec2(subtype, i):
     seed = 2000 + (subtype * 100) + i
 
     if subtype == 0:  # n_body_collision
-        rng = mulberry32(seed)
-        # Generate 5000 velocity vectors
-        velocities = []
-        for _ in range(5000):
-            vx = rng() * 200 - 100
-            vy = rng() * 200 - 100
-            velocities.append((vx, vy))
-        # Pick 2 indices deterministically from PRNG stream to plant duplicates
-        idx1 = mulberry32_int(rng, 0, 2499)
-        idx2 = mulberry32_int(rng, 2500, 4999)
-        # Plant: make idx2's velocity identical to idx1's
-        velocities[idx2] = velocities[idx1]
+        seed, hay = first_verified(seed, n_body_haystack, verify_n_body)
+        idx1, idx2 = hay["pair"]
         ans = f"{min(idx1, idx2)},{max(idx1, idx2)}"
         return make_question(
             f"sec2_sub0_{i}", "parallel-state", "n_body_collision",
@@ -215,26 +281,8 @@ def build_sec2(subtype, i):
         )
 
     elif subtype == 1:  # hex_stream_sync
-        rng = mulberry32(seed)
-        # Generate 1000 hex streams (each 64 chars)
-        streams = []
-        for _ in range(1000):
-            streams.append(mulberry32_hex_string(rng, 64))
-        # Pick 3 indices deterministically, plant identical 8-char subsequence
-        indices = sorted([
-            mulberry32_int(rng, 0, 333),
-            mulberry32_int(rng, 334, 666),
-            mulberry32_int(rng, 667, 999),
-        ])
-        # Generate the shared subsequence
-        shared_sub = mulberry32_hex_string(rng, 8)
-        # Plant at position 0 of each selected stream
-        for idx in indices:
-            s = list(streams[idx])
-            for c_i, c in enumerate(shared_sub):
-                s[c_i] = c
-            streams[idx] = "".join(s)
-        ans = ",".join(map(str, indices))
+        seed, hay = first_verified(seed, hex_stream_haystack, verify_hex_stream)
+        ans = ",".join(map(str, hay["indices"]))
         return make_question(
             f"sec2_sub1_{i}", "parallel-state", "hex_stream_sync",
             "1,000 hex streams rendered below. 3 streams emit an identical 8-char subsequence at position 0. Report their IDs as 'ID1,ID2,ID3' ascending.",
@@ -242,44 +290,26 @@ def build_sec2(subtype, i):
         )
 
     elif subtype == 2:  # prime_matrix_async
-        rng = mulberry32(seed)
-        # Generate 100x100 hex matrix (each cell 2 hex chars = 0-255)
-        matrix = []
-        for _ in range(10000):
-            matrix.append(mulberry32_int(rng, 0, 255))
-        # Pick a cell deterministically
-        px = mulberry32_int(rng, 0, 99)
-        py = mulberry32_int(rng, 0, 99)
-        # Plant a prime hex value at that cell
-        prime_val = 251  # largest prime < 256
-        matrix[py * 100 + px] = prime_val
+        seed, hay = first_verified(seed, prime_matrix_haystack, verify_prime_matrix)
+        px, py = hay["cell"]
         ans = f"{px},{py}"
         return make_question(
             f"sec2_sub2_{i}", "parallel-state", "prime_matrix_async",
-            f"100x100 hex matrix rendered below. One cell has been set to the value {prime_val:02X} (decimal {prime_val}). Submit its coordinate as 'X,Y'.",
+            f"100x100 hex matrix rendered below. One cell has been set to the value {PRIME_MATRIX_VALUE:02X} (decimal {PRIME_MATRIX_VALUE}). Submit its coordinate as 'X,Y'.",
             ans, "exact", client_seed=seed
         )
 
     elif subtype == 3:  # frequency_phase
         rng = mulberry32(seed)
-        # Generate 50 sine wave parameters: amplitude and frequency
-        params = []
-        for _ in range(50):
-            amp = rng() * 10
-            freq = rng() * 5 + 0.1
-            phase = rng() * 2 * math.pi
-            params.append((amp, freq, phase))
+        # Generate 50 sine wave parameters: amplitude, frequency, phase
+        u = rng.block(150).reshape(50, 3)
+        params = np.stack([u[:, 0] * 10, u[:, 1] * 5 + 0.1, u[:, 2] * 2 * math.pi], axis=1).tolist()
         # Find actual zero-crossing: sum of all sin(freq*t + phase)*amp == 0
         # Search PRNG index space for closest to zero
-        best_idx = 0
-        best_val = float("inf")
-        for t_idx in range(100001):
-            t = t_idx * 0.001
-            total = sum(a * math.sin(f * t + p) for a, f, p in params)
-            if abs(total) < best_val:
-                best_val = abs(total)
-                best_idx = t_idx
-        ans = str(best_idx)
+        search = wave_zero_search(params, 100001, step=0.001)
+        if search["ties"]:
+            raise ValueError(f"frequency_phase seed {seed}: near-tie at {search['ties']}")
+        ans = str(search["index"])
         return make_question(
             f"sec2_sub3_{i}", "parallel-state", "frequency_phase",
             "50 sine waves with parameters rendered below. Find the time index (0-100000, step=0.001) where the sum of all amplitudes is closest to 0.00000.",
@@ -321,12 +351,9 @@ def build_sec2(subtype, i):
 
 def build_sec3(subtype, i):
     if subtype == 0:  # power_tower
-        A, B, C, M = 7 + i, 11 + i, 13 + i, 10007 + i
-        if not is_prime(M):
-            M += 1
-            while not is_prime(M):
-                M += 1
-        ans = str(pow(A, pow(B, C, M - 1), M))
+        A, B, C = 7 + i, 11 + i, 13 + i
+        M = next_prime(10007 + i)
+        ans = str(tower_mod([A, B, C], M))
         return make_question(
             f"sec3_sub0_{i}", "recursive-exec", "power_tower",
             f"Calculate exact integer value of {A}^({B}^{C}) modulo {M}.",
@@ -335,9 +362,8 @@ def build_sec3(subtype, i):
 
     elif subtype == 1:  # deep_array_shift
         N = 50000 + i * 100
-        primes = sum(1 for x in range(2, N + 1) if is_prime(x))
-        composites = (N - 1) - primes
-        ans = str((0 + ((primes - composites) % 5)) % 5)
+        # N=1 is not prime, so it shifts right too: pi(N) lefts, N - pi(N) rights.
+        ans = str(prime_shift_offset(1, N, 5))
         return make_question(
             f"sec3_sub1_{i}", "recursive-exec", "deep_array_shift",
             f"Array A=[0,1,2,3,4]. For N=1 to {N}: shift left by 1 if N is prime, else shift right by 1. Value at index 0 upon completion?",
@@ -347,19 +373,7 @@ def build_sec3(subtype, i):
     elif subtype == 2:  # matrix_recurrence
         n = 100000 + i
         A_val, B_val, M = 3, 5, 1009
-
-        def mat_pow(m, p, mod):
-            res = np.eye(2, dtype=object)
-            base = m % mod
-            while p > 0:
-                if p % 2 == 1:
-                    res = np.dot(res, base) % mod
-                base = np.dot(base, base) % mod
-                p //= 2
-            return res
-
-        final_mat = mat_pow(np.array([[A_val, B_val], [1, 0]], dtype=object), n - 1, M)
-        ans = str(int(final_mat[0][0] * 1) % M)
+        ans = str(linear_recurrence([A_val, B_val], [0, 1], n, M))
         return make_question(
             f"sec3_sub2_{i}", "recursive-exec", "matrix_recurrence",
             f"Given f(0)=0, f(1)=1. f(n) = ({A_val}*f(n-1) + {B_val}*f(n-2)) mod {M}. Evaluate f({n}).",
@@ -371,11 +385,10 @@ def build_sec3(subtype, i):
         rng = mulberry32(seed)
         num_inputs = 25000 + i
         # Generate inputs using mulberry32
-        inputs = [mulberry32_int(rng, 0, 255) for _ in range(num_inputs)]
-        # Simulate FSM: state = (state + input%7) % 50
-        state = 0
-        for inp in inputs:
-            state = (state + inp % 7) % 50
+        inputs = mulberry32_int_block(rng, 0, 255, num_inputs)
+        # Simulate FSM: state = (state + input%7) % 50 -- additive mod 50, so
+        # the final state is the total of input%7 mod 50
+        state = int((inputs % 7).sum() % 50)
         ans = str(state)
         return make_question(
             f"sec3_sub3_{i}", "recursive-exec", "deep_fsm",
@@ -383,12 +396,10 @@ def build_sec3(subtype, i):
             ans, "exact", client_seed=seed
         )
 
-    elif subtype == 4:  # bounded_ackermann -- closed form for m=3
+    elif subtype == 4:  # bounded_ackermann
         n_val = i + 5
-        # Ackermann(3, n) = 2^(n+3) - 3 (exact closed form)
-        ans = str(pow(2, n_val + 3, 1000) - 3)
-        if int(ans) < 0:
-            ans = str(int(ans) + 1000)
+        # A(3, n) = 2^(n+3) - 3; ackermann_mod covers any m via hyperoperations.
+        ans = str(ackermann_mod(3, n_val, 1000))
         return make_question(
             f"sec3_sub4_{i}", "recursive-exec", "bounded_ackermann",
             f"Evaluate bounded Ackermann H(3, {n_val}) modulo 1000. Recursion depth capped at 1000 (returns n%1000 at cap).",
@@ -411,16 +422,11 @@ def build_sec4(subtype, i):
         block_size = 15
         plant_start = mulberry32_int(rng, 1000, num_floats - block_size - 1000)
         # Generate all floats -- use pairs for Box-Muller
-        floats = []
-        for _ in range(num_floats // 2 + 1):
-            u1 = max(rng(), 1e-10)
-            u2 = rng()
-            z0 = math.sqrt(-2 * math.log(u1)) * math.cos(2 * math.pi * u2)
-            z1 = math.sqrt(-2 * math.log(u1)) * math.sin(2 * math.pi * u2)
-            floats.append(z0)
-            floats.append(z1)
-        floats = floats[:num_floats]
-        # Plant: multiply block by 1.05 (variance drift)
+        floats = mulberry32_normals_block(rng, num_floats).tolist()
+        # Plant: multiply block by 1.05 (variance drift). Not identifiable:
+        # scca_signal.block_log_likelihood_ratio(std=1.05) ranks the planted
+        # block first for none of the ten seeds, one reason phase0_bank_repair
+        # drops this family.
         for j in range(plant_start, plant_start + block_size):
             floats[j] *= 1.05
         ans = str(plant_start)
@@ -431,18 +437,10 @@ def build_sec4(subtype, i):
         )
 
     elif subtype == 1:  # bitwise_palindrome
-        rng = mulberry32(seed)
-        num_chars = 50000
-        # Generate hex chars
-        chars = list(mulberry32_hex_string(rng, num_chars))
-        # Pick a starting index for a 64-char palindrome
-        plant_start = mulberry32_int(rng, 100, num_chars - 65)
-        # Generate a 32-char half, mirror it to create palindrome
-        half = mulberry32_hex_string(rng, 32)
-        palindrome = half + half[::-1]
-        for j in range(64):
-            chars[plant_start + j] = palindrome[j]
-        ans = str(plant_start)
+        seed, hay = first_verified(seed, palindrome_haystack, verify_palindrome)
+        # Read the answer back from the haystack, not from the planting code
+        (start,) = palindromic_windows(hay["chars"], 64)
+        ans = str(start)
         return make_question(
             f"sec4_sub1_{i}", "micro-pattern", "bitwise_palindrome",
             "Within 50,000 hex chars rendered below, find the single 64-char block that is a perfect palindrome. Submit starting index.",
@@ -456,9 +454,7 @@ def build_sec4(subtype, i):
         target = [0.0, 1.0, 0.0, -1.0/6.0, 0.0, 1.0/120.0, 0.0]
         num_floats = 250000
         # Generate float stream
-        floats = []
-        for _ in range(num_floats):
-            floats.append(rng() * 2 - 1)  # range [-1, 1]
+        floats = (rng.block(num_floats) * 2 - 1).tolist()  # range [-1, 1]
         # Plant the target sequence at a deterministic index
         plant_idx = mulberry32_int(rng, 10000, num_floats - 8)
         for j in range(7):
@@ -473,36 +469,23 @@ def build_sec4(subtype, i):
     elif subtype == 3:  # hash_anomaly
         rng = mulberry32(seed)
         num_strings = 10000
-        # Generate 10000 32-byte hex strings
-        strings = []
-        for _ in range(num_strings):
-            strings.append(mulberry32_hex_string(rng, 64))  # 32 bytes = 64 hex chars
-        # Plant one whose SHA-256 starts with "00000"
-        # We keep trying deterministic modifications until we find one
+        # Generate 10000 32-byte hex strings (32 bytes = 64 hex chars)
+        hex_chars = mulberry32_hex_block(rng, num_strings * 64)
+        strings = [hex_chars[j:j + 64] for j in range(0, len(hex_chars), 64)]
+        # Plant one whose SHA-256 starts with HASH_ANOMALY_ZEROS hex zeros
         plant_idx = mulberry32_int(rng, 0, num_strings - 1)
-        # Brute force a suffix that produces leading "00000"
+        # Smallest 6-hex-digit suffix (< 10^6) that works, else the smallest
+        # 64-hex-digit counter string
         base = strings[plant_idx][:58]  # keep first 58 chars, vary last 6
-        found = False
-        for attempt in range(1000000):
-            candidate = base + f"{attempt:06x}"
-            h = hashlib.sha256(candidate.encode()).hexdigest()
-            if h.startswith("00000"):
-                strings[plant_idx] = candidate
-                found = True
-                break
-        if not found:
-            # Fallback: just use a known hash-collision string
-            for attempt in range(10000000):
-                candidate = f"{attempt:064x}"
-                h = hashlib.sha256(candidate.encode()).hexdigest()
-                if h.startswith("00000"):
-                    strings[plant_idx] = candidate
-                    found = True
-                    break
+        search = nonce_search(base, HASH_ANOMALY_ZEROS, 6, stop=1000000, pool=shared_pool())
+        if search["nonce"] is None:
+            search = nonce_search("", HASH_ANOMALY_ZEROS, 64, stop=10000000, pool=shared_pool())
+        if search["nonce"] is not None:
+            strings[plant_idx] = search["candidate"]
         ans = str(plant_idx)
         return make_question(
             f"sec4_sub3_{i}", "micro-pattern", "hash_anomaly",
-            "10,000 32-byte hex strings rendered below. Identify the index of the string whose SHA-256 hash begins with '00000'.",
+            f"10,000 32-byte hex strings rendered below. Identify the index of the string whose SHA-256 hash begins with '{'0' * HASH_ANOMALY_ZEROS}'.",
             ans, "exact", client_seed=seed
         )
 
@@ -588,31 +571,8 @@ def build_sec5(subtype, i):
         )
 
     elif subtype == 3:  # trajectory_spline -- FIXED: use mulberry32
-        rng = mulberry32(seed)
-        # Generate 20 node positions in 2D
-        nodes = []
-        for node_id in range(20):
-            x = rng() * 100
-            y = rng() * 100
-            nodes.append((node_id, x, y))
-        # Compute nearest-neighbor traversal starting from node 0
-        visited = [0]
-        current = 0
-        remaining = set(range(1, 20))
-        while remaining:
-            best_dist = float("inf")
-            best_node = -1
-            cx, cy = nodes[current][1], nodes[current][2]
-            for node_id in remaining:
-                nx, ny = nodes[node_id][1], nodes[node_id][2]
-                d = math.sqrt((cx - nx) ** 2 + (cy - ny) ** 2)
-                if d < best_dist:
-                    best_dist = d
-                    best_node = node_id
-            visited.append(best_node)
-            remaining.remove(best_node)
-            current = best_node
-        ans = "-".join(map(str, visited[:5]))  # First 5 nodes in traversal
+        seed, hay = first_verified(seed, trajectory_haystack, verify_tour_ties)
+        ans = "-".join(map(str, hay["tour"]))  # First 5 nodes in traversal
         return make_question(
             f"sec5_sub3_{i}", "attentional", "trajectory_spline",
             "20 nodes with 2D positions rendered below. Starting from node 0, compute the nearest-neighbor traversal. Submit first 5 node IDs: 'ID-ID-ID-ID-ID'.",
@@ -620,20 +580,7 @@ def build_sec5(subtype, i):
         )
 
     elif subtype == 4:  # peripheral_cipher -- FIXED: use mulberry32
-        rng = mulberry32(seed)
-        # Generate plaintext (20 uppercase letters)
-        alpha = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
-        plaintext = "".join(mulberry32_choices(rng, alpha, 20))
-        # Generate substitution key (permutation of alphabet)
-        key = alpha[:]
-        # Fisher-Yates shuffle with mulberry32
-        for j in range(25, 0, -1):
-            k = mulberry32_int(rng, 0, j)
-            key[j], key[k] = key[k], key[j]
-        # Apply substitution cipher
-        sub_map = {alpha[j]: key[j] for j in range(26)}
-        ciphertext = "".join(sub_map[c] for c in plaintext)
-        ans = ciphertext
+        ans = str(peripheral_cipher_batch([seed])["ciphertext"][0])
         return make_question(
             f"sec5_sub4_{i}", "attentional", "peripheral_cipher",
             f"Plaintext and substitution cipher key shown below. Apply the substitution cipher to the 20-character plaintext. Submit the 20-character ciphertext.",
@@ -641,10 +588,53 @@ def build_sec5(subtype, i):
         )
 
 
+def peripheral_cipher_batch(seeds):
+    """Columnar peripheral_cipher items, one mulberry32 lane per seed.
+
+    Same draw order as the scalar generator: a 20-letter plaintext (choices
+    from A-Z), then a Fisher-Yates substitution key. Returns "key" as (n, 26)
+    letter indices and "plaintext"/"ciphertext" as 20-letter strings.
+    """
+    lanes = Mulberry32Lanes(seeds)
+    plaintext = mulberry32_int_lanes(lanes, 0, 25, 20)
+    key = np.tile(np.arange(26, dtype=np.int64), (len(lanes), 1))
+    mulberry32_shuffle_lanes(lanes, key)
+    ciphertext = np.take_along_axis(key, plaintext, axis=1)
+    return {
+        "seed": np.asarray(seeds, dtype=np.int64),
+        "key": key,
+        "plaintext": letter_strings(plaintext),
+        "ciphertext": letter_strings(ciphertext),
+    }
+
+
 # ============================================================================
 # Section 6: Bayesian
 # ============================================================================
 
+GMM_ROUND_MARGIN = 1e-9  # min distance of a gmm_update mean from a rounding boundary
+
+
+def verify_gmm_step(em, decimals):
+    """gmm_em works in log space, so its mean agrees with the old scalar
+    E-step only to rounding (~1e-15): every parameter must be finite and the
+    reported mean must sit clear of a rounding boundary at `decimals`."""
+    problems = [f"non-finite {name}" for name in ("means", "variances", "priors", "log_likelihood")
+                if not np.isfinite(em[name]).all()]
+    if problems:
+        return problems
+    scaled = float(em["means"][0]) * 10 ** decimals
+    if abs(scaled - math.floor(scaled) - 0.5) < GMM_ROUND_MARGIN * 10 ** decimals:
+        problems.append(f"mean {em['means'][0]!r} within {GMM_ROUND_MARGIN} of a rounding boundary")
+    return problems
+
+
+def normalise_row(row):
+    """row / sum(row), summed once, left to right as the scalar builder did."""
+    total = sum(row)
+    return [v / total for v in row]
+
+
 def build_sec6(subtype, i):
     if subtype == 0:  # dag_posterior (no PRNG needed)
         P_A = 0.1 + (i * 0.01)
@@ -663,45 +653,19 @@ def build_sec6(subtype, i):
         n_states = 5
         n_obs = 4
         seq_len = 500
-        # Generate transition matrix (n_states x n_states)
-        trans = []
-        for s in range(n_states):
-            row = [rng() for _ in range(n_states)]
-            total = sum(row)
-            trans.append([v / total for v in row])
-        # Generate emission matrix (n_states x n_obs)
-        emit = []
-        for s in range(n_states):
-            row = [rng() for _ in range(n_obs)]
-            total = sum(row)
-            emit.append([v / total for v in row])
-        # Generate initial probs
-        init = [rng() for _ in range(n_states)]
-        init_total = sum(init)
-        init = [v / init_total for v in init]
-        # Generate observation sequence
-        observations = [mulberry32_int(rng, 0, n_obs - 1) for _ in range(seq_len)]
-        # Run Viterbi algorithm
-        # V[t][s] = max probability of state sequence ending in state s at time t
-        import math as m
-        log_init = [m.log(max(p, 1e-300)) for p in init]
-        log_trans = [[m.log(max(p, 1e-300)) for p in row] for row in trans]
-        log_emit = [[m.log(max(p, 1e-300)) for p in row] for row in emit]
-        V = [log_init[s] + log_emit[s][observations[0]] for s in range(n_states)]
-        path = [[s] for s in range(n_states)]
-        for t in range(1, seq_len):
-            new_V = []
-            new_path = []
-            for s in range(n_states):
-                candidates = [(V[prev] + log_trans[prev][s] + log_emit[s][observations[t]], prev) for prev in range(n_states)]
-                best_val, best_prev = max(candidates, key=lambda x: x[0])
-                new_V.append(best_val)
-                new_path.append(path[best_prev] + [s])
-            V = new_V
-            path = new_path
-        best_final = max(range(n_states), key=lambda s: V[s])
+        # Transition (n_states x n_states), emission (n_states x n_obs) and
+        # initial probs, drawn in that order; rows normalised by their sums.
+        n_trans, n_emit = n_states * n_states, n_states * n_obs
+        u = rng.block(n_trans + n_emit + n_states).tolist()
+        trans = [u[k:k + n_states] for k in range(0, n_trans, n_states)]
+        emit = [u[k:k + n_obs] for k in range(n_trans, n_trans + n_emit, n_obs)]
+        trans = [normalise_row(row) for row in trans]
+        emit = [normalise_row(row) for row in emit]
+        init = normalise_row(u[n_trans + n_emit:])
+        observations = mulberry32_int_block(rng, 0, n_obs - 1, seq_len)
+        path, _ = viterbi(log_floor(init), log_floor(trans), log_floor(emit), observations)
         # Answer is the final state (500th, index 499)
-        ans = str(path[best_final][-1])
+        ans = str(int(path[-1]))
         return make_question(
             f"sec6_sub1_{i}", "bayesian", "hmm_viterbi",
             f"HMM with {n_states} states, {n_obs} observation symbols, {seq_len}-step sequence. Parameters and observations rendered below. Report the final hidden state in the Viterbi path.",
@@ -725,25 +689,20 @@ def build_sec6(subtype, i):
         rng = mulberry32(seed)
         # Generate 3 cluster centers (1D for simplicity)
         centers = [rng() * 10 for _ in range(3)]
-        # Generate 1000 data points from these clusters
+        # Generate 1000 data points from these clusters: per point, one
+        # cluster draw then one noise draw.
         n_points = 1000
-        data_points = []
-        for _ in range(n_points):
-            cluster = mulberry32_int(rng, 0, 2)
-            # Point near center with some noise
-            noise = (rng() - 0.5) * 2  # [-1, 1]
-            data_points.append(centers[cluster] + noise)
-        # Run one EM update step for cluster 0
-        # E-step: compute responsibilities assuming equal priors and unit variance
-        responsibilities = []
-        for dp in data_points:
-            dists = [math.exp(-0.5 * (dp - c) ** 2) for c in centers]
-            total = sum(dists)
-            responsibilities.append([d / total for d in dists])
-        # M-step: update mean of cluster 0
-        num = sum(responsibilities[j][0] * data_points[j] for j in range(n_points))
-        den = sum(responsibilities[j][0] for j in range(n_points))
-        new_mean = num / den
+        u = rng.block(2 * n_points).reshape(n_points, 2)
+        cluster = np.floor(u[:, 0] * 3).astype(np.int64)
+        noise = (u[:, 1] - 0.5) * 2  # [-1, 1]
+        data_points = np.array(centers)[cluster] + noise
+        # One EM step with equal priors and unit variance; report cluster 0's mean
+        em = gmm_em(data_points, centers, iterations=1,
+                    update_variances=False, update_priors=False)
+        problems = verify_gmm_step(em, 6)
+        if problems:
+            raise ValueError(f"gmm_update seed {seed}: {problems}")
+        new_mean = float(em["means"][0])
         ans = f"{new_mean:.6f}"
         return make_question(
             f"sec6_sub3_{i}", "bayesian", "gmm_update",
@@ -776,10 +735,8 @@ def build_sec7(subtype, i):
     if subtype == 0:  # xor_1024bit
         rng = mulberry32(seed)
         # Generate 5 x 256-char hex strings using mulberry32
-        values = []
-        for _ in range(5):
-            hex_str = mulberry32_hex_string(rng, 256).upper()
-            values.append(int(hex_str, 16))
+        hex_chars = mulberry32_hex_block(rng, 5 * 256)
+        values = [int(hex_chars[j:j + 256], 16) for j in range(0, len(hex_chars), 256)]
         xor_val = 0
         for v in values:
             xor_val ^= v
@@ -793,15 +750,9 @@ def build_sec7(subtype, i):
     elif subtype == 1:  # aes_state_matrix
         rng = mulberry32(seed)
         # Generate 4x4 state matrix (16 bytes)
-        matrix = [mulberry32_int(rng, 0, 255) for _ in range(16)]
-        # AES ShiftRows: row 0 no shift, row 1 shift left 1, row 2 shift left 2, row 3 shift left 3
-        # Matrix is column-major: index = row + 4*col
-        # Row r, Col c -> index r + 4*c
-        # After ShiftRows: row r, col c -> row r, col (c+r)%4
-        shifted = [0] * 16
-        for r in range(4):
-            for c in range(4):
-                shifted[r + 4 * c] = matrix[r + 4 * ((c + r) % 4)]
+        matrix = mulberry32_int_block(rng, 0, 255, 16).tolist()
+        # Column-major state (row r, col c at r + 4*c); ShiftRows moves row r left by r.
+        shifted = shift_rows(matrix)[0].tolist()
         # Output 2nd row (row index 1): shifted[1], shifted[5], shifted[9], shifted[13]
         ans = f"{shifted[1]:02X}{shifted[5]:02X}{shifted[9]:02X}{shifted[13]:02X}"
         return make_question(
@@ -812,13 +763,11 @@ def build_sec7(subtype, i):
 
     elif subtype == 2:  # massive_lcg
         M = 2 ** 128
-        A = 1664526
+        A = 1664525
         C = 1013904223
         X0 = 123456789 + i
         N = 1000000
-        A_N = pow(A, N, M)
-        geom = (C * (A_N - 1) * pow(A - 1, -1, M)) % M
-        ans = f"{((A_N * X0) + geom) % M:032X}"
+        ans = f"{lcg_jump(X0, N, A, C, M):032X}"
         return make_question(
             f"sec7_sub2_{i}", "crypto-bitwise", "massive_lcg",
             f"Given 128-bit LCG (A={A}, C={C}, M=2^128, Seed={X0}). Calculate exact state X_1000000. Submit 32 uppercase hex chars.",
@@ -828,16 +777,10 @@ def build_sec7(subtype, i):
     elif subtype == 3:  # bit_shift_matrix
         rng = mulberry32(seed)
         # Generate initial 256-bit value from mulberry32
-        hex_str = mulberry32_hex_string(rng, 64).upper()
-        val = int(hex_str, 16)
-        mask = (1 << 256) - 1
-        for j in range(50):
-            shift = (j * 7 + i) % 256
-            if j % 2 == 0:
-                val = ((val << shift) | (val >> (256 - shift))) & mask
-            else:
-                val = ((val >> shift) | (val << (256 - shift))) & mask
-        ans = f"{val:064X}"
+        val = int(mulberry32_hex_block(rng, 64), 16)
+        chain = compile_chain(256, [("ROTL" if j % 2 == 0 else "ROTR", (j * 7 + i) % 256)
+                                    for j in range(50)])
+        ans = f"{chain(val):064X}"
         return make_question(
             f"sec7_sub3_{i}", "crypto-bitwise", "bit_shift_matrix",
             "Apply 50 deterministic circular bit-shifts to the 256-bit integer rendered below. Provide final 64-char uppercase hex result.",
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+GF(2) bit-operation composer for the rotate/shift/XOR families
+(bit_shift_matrix, bit_shift_small, xor_chain_small).
+
+Every op on a w-bit word -- rotate, shift, XOR / AND with a constant, NOT,
+x ^= x << k -- is affine over GF(2)^w, so a whole chain compiles to one map
+
+    f(x) = M x ^ c
+
+stored as the w columns of M (column j = M e_j, one w-bit int each) plus
+the constant c. Applying or composing maps costs O(w^2) bit operations
+whatever the chain length, and power(n) repeats a chain n times in
+O(w^2 log n).
+
+compile_chain keeps chains of rotates, shifts and constant XOR/AND in the
+form f(x) = (rot_r(x) & mask) ^ c, which costs O(1) big-int ops per step,
+so 10^6-step chains compile in about a second; only the x ^= x << k ops
+switch to updating every column, O(w) per op. A chain whose linear part is a pure
+rotation reports it through BitAffine.rotation().
+
+Ops are (name, arg) tuples:
+
+  ROTL k / ROTR k    rotate left / right by k (mod w)
+  SHL k / SHR k      shift, keeping w bits
+  XOR k / AND k      with a constant
+  NOT                complement (arg ignored)
+  XORSHL k / XORSHR k   x ^= x << k / x ^= x >> k (xorshift steps)
+"""
+
+
+def _full(width):
+    return (1 << width) - 1
+
+
+def rotl(x, k, width):
+    """x rotated left by k within `width` bits."""
+    k %= width
+    return ((x << k) | (x >> (width - k))) & _full(width) if k else x
+
+
+def _parity_columns(cols, v):
+    """M v for M given by its columns: XOR of the columns at v's set bits."""
+    out, j = 0, 0
+    while v:
+        if v & 1:
+            out ^= cols[j]
+        v >>= 1
+        j += 1
+    return out
+
+
+class BitAffine:
+    """x -> M x ^ const over GF(2)^width, M stored column-packed."""
+
+    __slots__ = ("width", "cols", "const")
+
+    def __init__(self, width, cols, const=0):
+        if len(cols) != width:
+            raise ValueError(f"{len(cols)} columns for width {width}")
+        self.width = width
+        self.cols = list(cols)
+        self.const = const & _full(width)
+
+    @classmethod
+    def identity(cls, width):
+        return cls(width, [1 << j for j in range(width)])
+
+    @classmethod
+    def rotation_map(cls, width, r, mask=None, const=0):
+        """x -> (rot_r(x) & mask) ^ const."""
+        mask = _full(width) if mask is None else mask
+        return cls(width, [rotl(1 << j, r, width) & mask for j in range(width)], const)
+
+    def __call__(self, x):
+        return _parity_columns(self.cols, x & _full(self.width)) ^ self.const
+
+    def __eq__(self, other):
+        return (isinstance(other, BitAffine) and self.width == other.width
+                and self.cols == other.cols and self.const == other.const)
+
+    def __repr__(self):
+        r = self.rotation()
+        linear = f"rot {r}" if r is not None else f"{self.width}x{self.width}"
+        return f"BitAffine({linear}, const=0x{self.const:x})"
+
+    def compose(self, inner):
+        """self o inner: x -> self(inner(x))."""
+        if inner.width != self.width:
+            raise ValueError("width mismatch")
+        return BitAffine(self.width,
+                         [_parity_columns(self.cols, c) for c in inner.cols],
+                         _parity_columns(self.cols, inner.const) ^ self.const)
+
+    def then(self, outer):
+        """outer o self: run this chain, then `outer`."""
+        return outer.compose(self)
+
+    def power(self, n):
+        """This map applied n times, by repeated squaring."""
+        result, base = BitAffine.identity(self.width), self
+        while n:
+            if n & 1:
+                result = base.compose(result)
+            base = base.compose(base)
+            n >>= 1
+        return result
+
+    def rotation(self):
+        """r if the linear part is a rotation left by r, else None."""
+        r = self.cols[0].bit_length() - 1
+        if r < 0 or self.cols[0] != 1 << r:
+            return None
+        return r if all(c == rotl(1 << j, r, self.width) for j, c in enumerate(self.cols)) else None
+
+    def rows(self):
+        """M as packed rows (bit j of row i = M[i, j])."""
+        rows = [0] * self.width
+        for j, c in enumerate(self.cols):
+            i = 0
+            while c:
+                if c & 1:
+                    rows[i] |= 1 << j
+                c >>= 1
+                i += 1
+        return rows
+
+
+# ============================================================================
+# Chains
+# ============================================================================
+
+LINEAR_OPS = ("ROTL", "ROTR", "SHL", "SHR", "XOR", "AND", "NOT", "XORSHL", "XORSHR")
+
+
+def _apply_general(f, op, k):
+    """op o f for a general map, O(w) big-int ops (O(1) for XOR / NOT)."""
+    if op in ("XOR", "NOT"):
+        return BitAffine(f.width, f.cols, run_chain(f.width, [(op, k)], f.const))
+    step = lambda v: run_chain(f.width, [(op, k)], v)
+    return BitAffine(f.width, [step(c) for c in f.cols], step(f.const))
+
+
+def compile_chain(width, ops):
+    """Compile (name, arg) ops, applied first to last, into one BitAffine."""
+    full = _full(width)
+    r, mask, const = 0, full, 0  # f(x) = (rot_r(x) & mask) ^ const
+    general = None
+    for step, (op, k) in enumerate(ops):
+        if op not in LINEAR_OPS:
+            raise ValueError(f"step {step}: unknown op {op!r}")
+        if general is None and op in ("XORSHL", "XORSHR"):
+            general = BitAffine.rotation_map(width, r, mask, const)
+        if general is not None:
+            general = _apply_general(general, op, k)
+            continue
+        if op in ("ROTL", "ROTR"):
+            s = k % width if op == "ROTL" else -k % width
+            r, mask, const = (r + s) % width, rotl(mask, s, width), rotl(const, s, width)
+        elif op in ("SHL", "SHR"):
+            if k >= width:
+                mask = const = 0
+            else:
+                s, keep = (k, (full << k) & full) if op == "SHL" else (width - k, full >> k)
+                r = (r + s) % width
+                mask = rotl(mask, s, width) & keep
+                const = rotl(const, s, width) & keep
+        elif op == "XOR":
+            const ^= k & full
+        elif op == "AND":
+            mask &= k
+            const &= k
+        else:  # NOT
+            const ^= full
+    if general is not None:
+        return general
+    return BitAffine.rotation_map(width, r, mask, const)
+
+
+def run_chain(width, ops, x):
+    """x pushed through the ops one at a time (the reference the compiled
+    map is checked against)."""
+    full = _full(width)
+    x &= full
+    for op, k in ops:
+        if op == "ROTL":
+            x = rotl(x, k, width)
+        elif op == "ROTR":
+            x = rotl(x, -k, width)
+        elif op == "SHL":
+            x = (x << k) & full
+        elif op == "SHR":
+            x >>= k
+        elif op == "XOR":
+            x ^= k & full
+        elif op == "AND":
+            x &= k
+        elif op == "NOT":
+            x ^= full
+        elif op == "XORSHL":
+            x ^= (x << k) & full
+        elif op == "XORSHR":
+            x ^= x >> k
+        else:
+            raise ValueError(f"unknown op {op!r}")
+    return x
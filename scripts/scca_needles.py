@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Planted-needle uniqueness verifier for the machine-scale haystack families.
+
+n_body_collision, hex_stream_sync, prime_matrix_async and bitwise_palindrome
+each plant one needle in a large random haystack that the client renders from
+clientSeed. The stored answer is only correct if the haystack does not also
+contain a needle by chance, so the builders regenerate each haystack and run
+it through a check here before emitting the item:
+
+  - verify_duplicate_rows: the planted rows are the only repeated rows
+    (np.unique over a structured void view, one row = one key)
+  - verify_prefix_group: the planted streams are the only ones sharing a
+    prefix (prefixes packed into one integer key each)
+  - verify_single_value: the planted cell is the only cell holding its value
+  - verify_palindrome_window: the planted window is the only palindromic one
+    (palindromic_windows: one rolling-hash pass, exact)
+  - verify_block_max: the planted block is the unique top-scoring window of
+    a sliding-window statistic (scca_signal.block_log_likelihood_ratio)
+
+Each check returns a list of problems (empty when the answer is unique).
+first_verified() wraps a builder: it tries seed, seed + RESEED_STRIDE, ...
+and returns the first seed whose haystack passes. A 10,000-row haystack
+checks in well under a millisecond, so this runs on every build.
+"""
+
+from collections import Counter
+
+import numpy as np
+
+
+RESEED_STRIDE = 100_000  # clear of every builder's seed range
+RESEED_ATTEMPTS = 8
+
+
+def first_verified(seed, build, verify, attempts=RESEED_ATTEMPTS):
+    """(seed', build(seed')) for the first seed' = seed + k * RESEED_STRIDE
+    whose haystack verify() accepts; ValueError if none of `attempts` do."""
+    rejected = []
+    for k in range(attempts):
+        candidate = seed + k * RESEED_STRIDE
+        item = build(candidate)
+        problems = verify(item)
+        if not problems:
+            return candidate, item
+        rejected.append((candidate, problems))
+    raise ValueError(f"no unique-needle haystack from seed {seed}: {rejected}")
+
+
+# ============================================================================
+# Checks
+# ============================================================================
+
+def row_keys(rows):
+    """One opaque np.void key per row of a 2D array, for np.unique."""
+    rows = np.ascontiguousarray(rows)
+    return rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1])))[:, 0]
+
+
+def duplicate_groups(keys):
+    """Index groups (ascending) of equal entries in a 1D key array."""
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+    dup = np.nonzero(counts[inverse] > 1)[0]
+    order = dup[np.argsort(inverse[dup], kind="stable")]
+    splits = np.nonzero(np.diff(inverse[order]))[0] + 1
+    return [g.tolist() for g in np.split(order, splits)] if len(order) else []
+
+
+def verify_duplicate_rows(rows, planted):
+    """The rows at `planted` are equal and no other rows repeat."""
+    groups = duplicate_groups(row_keys(rows))
+    want = sorted(planted)
+    return [f"rows {g} repeat" for g in groups if g != want] + (
+        [] if want in groups else [f"planted rows {want} are not a duplicate group"])
+
+
+def pack_prefixes(nibbles, width):
+    """First `width` (<= 16) hex digits of each row as one uint64 key."""
+    keys = np.zeros(len(nibbles), dtype=np.uint64)
+    for j in range(width):
+        keys = (keys << np.uint64(4)) | nibbles[:, j].astype(np.uint64)
+    return keys
+
+
+def verify_prefix_group(nibbles, width, planted):
+    """Rows at `planted` share their `width`-digit prefix and no others do."""
+    return verify_duplicate_rows(pack_prefixes(nibbles, width)[:, None], planted)
+
+
+def verify_single_value(cells, value, index):
+    """cells[index] == value and no other cell holds value."""
+    hits = np.flatnonzero(np.asarray(cells) == value).tolist()
+    return [] if hits == [index] else [f"value {value} at {hits}, planted at {index}"]
+
+
+def verify_palindrome_window(symbols, width, start):
+    """The only palindromic length-`width` window starts at `start`."""
+    hits = palindromic_windows(symbols, width).tolist()
+    return [] if hits == [start] else [f"palindromic windows at {hits}, planted at {start}"]
+
+
+def verify_block_max(scores, start):
+    """scores[start] is strictly greater than every other window's score."""
+    best = float(scores[start])
+    rivals = np.flatnonzero(np.asarray(scores) >= best).tolist()
+    return [] if rivals == [start] else [f"windows {rivals} score >= planted window {start}"]
+
+
+# ============================================================================
+# Palindromic windows (bitwise_palindrome, hex_palindrome_small)
+# ============================================================================
+
+HASH_BASE = 0x9E3779B97F4A7C15  # odd, so invertible mod 2^64
+HASH_BASE_INV = pow(HASH_BASE, -1, 1 << 64)
+
+
+def _powers(base, n):
+    """base^0 .. base^(n-1) mod 2^64 as uint64 (cumprod wraps)."""
+    out = np.empty(n, dtype=np.uint64)
+    out[0] = 1
+    out[1:] = base
+    return np.cumprod(out, dtype=np.uint64)
+
+
+def palindromic_windows(symbols, width):
+    """Start indices of every length-`width` window of `symbols` that reads
+    the same reversed, in one O(n) pass.
+
+    Polynomial hashes mod 2^64 over the prefix sums of a[t] * B^t and
+    a[t] * B^-t give, for every window at once, the hash of the window and
+    of its reverse. Windows whose hashes match are then compared directly,
+    so the result is exact: collisions cost a comparison, never a wrong
+    answer. 5 million nibbles scan in about 0.2 s.
+    """
+    a = np.asarray(symbols).astype(np.uint64)
+    n = len(a)
+    if width > n:
+        return np.zeros(0, dtype=np.int64)
+    if width <= 1:
+        return np.arange(n - width + 1)
+    m = n - width + 1
+    pw = _powers(HASH_BASE, n)
+    ipw = _powers(HASH_BASE_INV, n)
+    prefix = np.zeros(n + 1, dtype=np.uint64)
+    # window: sum_j a[i+j] B^j
+    np.cumsum(a * pw, out=prefix[1:])
+    window = prefix[width:] - prefix[:m]
+    window *= ipw[:m]
+    # mirror: sum_j a[i+j] B^(width-1-j)
+    np.cumsum(a * ipw, out=prefix[1:])
+    mirror = prefix[width:] - prefix[:m]
+    mirror *= pw[width - 1:]
+    cand = np.flatnonzero(window == mirror)
+    if not len(cand):
+        return cand
+    half = width // 2
+    exact = np.ones(len(cand), dtype=bool)
+    for j in range(half):
+        exact &= a[cand + j] == a[cand + width - 1 - j]
+    return cand[exact]
+
+
+# ============================================================================
+# Even-XOR pairs (hex_xor_match_small)
+# ============================================================================
+
+def parity_mask(width):
+    """0x11...1: the low bit of each of `width` hex digits."""
+    return int("1" * width, 16)
+
+
+def parity_key(values, width):
+    """Low bit of every hex digit, as one integer per value.
+
+    a ^ b has all-even digits exactly when every digit of a and b has the
+    same low bit, i.e. when parity_key(a) == parity_key(b). A width-w
+    haystack has 2^w keys, so it holds at most 2^w strings with no even-XOR
+    pair among them.
+
+    Sequences come back as a uint64 array while the keys fit (width <= 16),
+    else as a list of Python ints.
+    """
+    if isinstance(values, int):
+        return values & parity_mask(width)
+    if width > 16:
+        mask = parity_mask(width)
+        return [int(v) & mask for v in values]
+    return np.asarray(values, dtype=np.uint64) & np.uint64(parity_mask(width))
+
+
+def even_xor_pairs(values, width):
+    """Exact number of pairs (i < j) whose XOR has all-even hex digits."""
+    if width > 16:
+        counts = np.array(list(Counter(parity_key(values, width)).values()), dtype=np.int64)
+    else:
+        _, counts = np.unique(parity_key(values, width), return_counts=True)
+    return int((counts * (counts - 1) // 2).sum())
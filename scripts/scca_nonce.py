@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Deterministic parallel nonce search (hash_anomaly).
+
+Finds the smallest nonce n in [start, stop) such that
+
+    sha256((base + f"{n:0{width}x}").encode()).hexdigest()
+
+begins with `zeros` hex zeros. The nonce space is cut into NONCE_BLOCK-sized
+blocks, scanned in increasing order: each round maps the next `workers`
+blocks over a process pool (which worker takes which block is up to the
+pool) and the search stops after the first round with a hit, taking the
+smallest hit of that round. Every lower block has been fully scanned by
+then, so the answer is the smallest valid nonce whatever the worker count --
+the same nonce the old single-threaded loop returned.
+
+Pass `pool` (a multiprocessing.Pool or concurrent.futures executor) to reuse
+one set of worker processes across many searches; otherwise each call with
+workers > 1 starts and stops its own pool.
+
+Each block hashes from a copy of the pre-hashed base and tests the leading
+zeros on the raw digest, so one worker runs at roughly 1M hashes/s.
+
+Usage:
+  python3 scripts/scca_nonce.py BASE --zeros 6 --width 8 [--workers N]
+"""
+
+import argparse
+import atexit
+import hashlib
+import os
+import time
+from multiprocessing import Pool
+
+
+NONCE_BLOCK = 1 << 16
+
+_shared_pool = None
+
+
+def shared_pool():
+    """One process pool (all CPUs) kept for the rest of the run, for batch
+    builds that search once per item; None on a single CPU."""
+    global _shared_pool
+    workers = os.cpu_count() or 1
+    if _shared_pool is None and workers > 1:
+        _shared_pool = Pool(workers)
+        atexit.register(_shared_pool.terminate)
+    return _shared_pool
+
+
+def _leading_zero_test(zeros):
+    """Digest predicate: the first `zeros` hex digits are 0."""
+    full, half = divmod(zeros, 2)
+    prefix = bytes(full)
+    if half:
+        return lambda d: d.startswith(prefix) and d[full] < 16
+    return lambda d: d.startswith(prefix)
+
+
+def _scan_block(args):
+    """(first hit in [lo, hi) or None, hashes done) for one block."""
+    base, width, zeros, lo, hi = args
+    prefix = hashlib.sha256(base.encode())
+    ok = _leading_zero_test(zeros)
+    fmt = f"0{width}x"
+    for n in range(lo, hi):
+        h = prefix.copy()
+        h.update(format(n, fmt).encode())
+        if ok(h.digest()):
+            return n, n - lo + 1
+    return None, hi - lo
+
+
+def nonce_search(base, zeros, width, start=0, stop=None, workers=None, block=NONCE_BLOCK, pool=None):
+    """Smallest nonce in [start, stop) whose candidate hash has `zeros` leading
+    hex zeros (stop defaults to 16^width, every nonce that fits the width).
+
+    pool, if given, runs the blocks and is left open for the caller; workers
+    then only sets how many blocks go out per round.
+
+    Returns a dict: nonce (None if the range has none), candidate, digest,
+    hashes (total hashed, across workers), seconds, rate (hashes/s).
+    """
+    stop = 16 ** width if stop is None else stop
+    workers = workers or os.cpu_count() or 1
+    blocks = [(base, width, zeros, lo, min(lo + block, stop)) for lo in range(start, stop, block)]
+
+    t0 = time.perf_counter()
+    nonce, hashes = None, 0
+    own_pool = Pool(workers) if pool is None and workers > 1 else None
+    try:
+        runner = pool if pool is not None else own_pool
+        run = (lambda f, xs: list(runner.map(f, xs))) if runner else (lambda f, xs: list(map(f, xs)))
+        for r in range(0, len(blocks), workers):
+            results = run(_scan_block, blocks[r:r + workers])
+            hashes += sum(count for _, count in results)
+            hits = [hit for hit, _ in results if hit is not None]
+            if hits:
+                nonce = min(hits)
+                break
+    finally:
+        if own_pool:
+            own_pool.close()
+            own_pool.join()
+    seconds = time.perf_counter() - t0
+
+    candidate = digest = None
+    if nonce is not None:
+        candidate = base + format(nonce, f"0{width}x")
+        digest = hashlib.sha256(candidate.encode()).hexdigest()
+    return {
+        "nonce": nonce,
+        "candidate": candidate,
+        "digest": digest,
+        "hashes": hashes,
+        "seconds": seconds,
+        "rate": hashes / seconds if seconds else float("inf"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base", help="fixed candidate prefix")
+    parser.add_argument("--zeros", type=int, default=5, help="leading hex zeros required")
+    parser.add_argument("--width", type=int, default=6, help="hex digits of nonce appended to the base")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all CPUs)")
+    args = parser.parse_args()
+
+    res = nonce_search(args.base, args.zeros, args.width, workers=args.workers)
+    if res["nonce"] is None:
+        print(f"no nonce of width {args.width} gives {args.zeros} zeros ({res['hashes']:,} hashes)")
+    else:
+        print(f"nonce {res['nonce']} -> {res['candidate']}\n  sha256 {res['digest']}")
+    print(f"  {res['hashes']:,} hashes in {res['seconds']:.2f}s ({res['rate'] / 1e6:.2f} MH/s)")
+
+
+if __name__ == "__main__":
+    main()
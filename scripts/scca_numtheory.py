@@ -0,0 +1,715 @@
+#!/usr/bin/env python3
+"""
+Number-theory kernels for the dataset builders.
+
+Shared by scca_architect.py, build_tier2.py and phase0_bank_repair.py so the
+prime families (deep_array_shift, power_tower, array_shift_small) stop
+re-running trial division per integer, and massive_lcg stops stepping its
+generator one state at a time:
+
+  - is_prime: deterministic Miller-Rabin below ~3.3 * 10^24 (every 64-bit
+    n), Baillie-PSW above
+  - segmented_sieve / primes_up_to: NumPy sieves with bounded memory
+  - prime_count: pi(N) by the Lucy_Hedgehog recurrence, O(N^(3/4)), memoized
+  - lcg_jump / lcg_jump_batch: X_n of an LCG in O(log n), any modulus
+  - discrete_log / discrete_log_batch: minimal exponent by Pohlig-Hellman
+    over baby-step giant-step, for 64-bit and larger primes
+  - linear_recurrence / linear_recurrence_batch: k-term recurrences mod M
+    at n = 10^18 (int64 matrix powers, Kitamasa for large k)
+  - tower_mod / hyperop_mod / ackermann_mod: power towers and
+    hyperoperations mod any M down the Carmichael lambda chain
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+
+
+# ============================================================================
+# Primality
+# ============================================================================
+
+# Deterministic for n < MR_LIMIT (~3.3 * 10^24), which covers every 64-bit
+# value; larger n get a Baillie-PSW test (strong base 2 + strong Lucas),
+# which has no known counterexample.
+MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+MR_LIMIT = 3_317_044_064_679_887_385_961_981
+
+
+def _strong_probable_prime(n, a, d, s):
+    """n - 1 = d * 2^s with d odd: does n pass Miller-Rabin to base a?"""
+    x = pow(a, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+
+def jacobi(a, n):
+    """Jacobi symbol (a / n) for odd n > 0."""
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def _strong_lucas_probable_prime(n):
+    """Strong Lucas test with Selfridge's parameters (odd n, not a square)."""
+    D = 5
+    while True:
+        j = jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+
+    def half(x):
+        x %= n
+        return (x + n if x % 2 else x) // 2
+
+    d, s = n + 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    # U_k, V_k, Q^k by doubling (k -> 2k) and stepping (k -> k + 1).
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U, V, Qk = U * V % n, (V * V - 2 * Qk) % n, Qk * Qk % n
+        if bit == "1":
+            U, V, Qk = half(P * U + V), half(D * U + P * V), Qk * Q % n
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V, Qk = (V * V - 2 * Qk) % n, Qk * Qk % n
+        if V == 0:
+            return True
+    return False
+
+
+def is_prime(n):
+    if n < 2:
+        return False
+    for p in MR_BASES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    if n < MR_LIMIT:
+        return all(_strong_probable_prime(n, a, d, s) for a in MR_BASES)
+    if math.isqrt(n) ** 2 == n:
+        return False
+    return _strong_probable_prime(n, 2, d, s) and _strong_lucas_probable_prime(n)
+
+
+def next_prime(n):
+    """Smallest prime >= n."""
+    while not is_prime(n):
+        n += 1
+    return n
+
+
+# ============================================================================
+# Sieves
+# ============================================================================
+
+SIEVE_SEGMENT = 1 << 20
+
+
+def primes_up_to(limit):
+    """All primes <= limit as an int64 array (plain sieve of Eratosthenes)."""
+    if limit < 2:
+        return np.zeros(0, dtype=np.int64)
+    mask = np.ones(limit + 1, dtype=bool)
+    mask[:2] = False
+    for p in range(2, math.isqrt(limit) + 1):
+        if mask[p]:
+            mask[p * p::p] = False
+    return np.nonzero(mask)[0].astype(np.int64)
+
+
+def segmented_sieve(lo, hi):
+    """Boolean primality mask for the integers in [lo, hi).
+
+    Only the base primes up to sqrt(hi) and one window are held in memory,
+    so a window far out (say [10^12, 10^12 + 10^6)) is as cheap as one near 0.
+    """
+    lo = max(lo, 0)
+    if hi <= lo:
+        return np.zeros(0, dtype=bool)
+    mask = np.ones(hi - lo, dtype=bool)
+    mask[:max(0, 2 - lo)] = False
+    for p in primes_up_to(math.isqrt(hi - 1)).tolist():
+        first = max(p * p, -(-lo // p) * p)
+        mask[first - lo::p] = False
+    return mask
+
+
+def count_primes_in_range(lo, hi, segment=SIEVE_SEGMENT):
+    """Number of primes in [lo, hi), sieved one segment at a time."""
+    return sum(int(segmented_sieve(a, min(a + segment, hi)).sum()) for a in range(lo, hi, segment))
+
+
+# ============================================================================
+# Prime counting
+# ============================================================================
+
+@lru_cache(maxsize=None)
+def prime_count(n):
+    """pi(n): the number of primes <= n (Lucy_Hedgehog, vectorized).
+
+    small[v] holds S(v) for v <= r and large[i] holds S(n // i) for i <= r,
+    where S starts as "count of 2..v" and each prime p <= r strikes out the
+    numbers whose least prime factor is p. Each update reads only entries
+    the same round has not yet written, which is what lets NumPy do a whole
+    round at once.
+    """
+    if n < 2:
+        return 0
+    r = math.isqrt(n)
+    small = np.arange(-1, r, dtype=np.int64)  # small[v] = v - 1
+    idx = np.arange(1, r + 1, dtype=np.int64)
+    large = np.zeros(r + 1, dtype=np.int64)
+    large[1:] = n // idx - 1
+    for p in range(2, r + 1):
+        if small[p] == small[p - 1]:
+            continue  # p is composite
+        sp = small[p - 1]
+        p2 = p * p
+        # large: i with n // i >= p^2
+        i = idx[: min(r, n // p2)]
+        ip = i * p
+        from_large = ip <= r
+        sub = np.empty(len(i), dtype=np.int64)
+        sub[from_large] = large[ip[from_large]]
+        sub[~from_large] = small[n // ip[~from_large]]
+        large[i] -= sub - sp
+        # small: v in [p^2, r]
+        if p2 <= r:
+            v = np.arange(p2, r + 1)
+            small[v] -= small[v // p] - sp
+    return int(large[1])
+
+
+def prime_shift_offset(n_lo, n_hi, size):
+    """Net left rotation (mod size) after "for N in n_lo..n_hi: shift left by 1
+    if N is prime, else right by 1" -- i.e. A[offset] ends up at index 0.
+
+    Left shifts = primes in range, right shifts = everything else (1 included).
+    """
+    primes = prime_count(n_hi) - prime_count(n_lo - 1)
+    total = n_hi - n_lo + 1
+    return (2 * primes - total) % size
+
+
+# ============================================================================
+# Affine maps / LCG jump-ahead
+# ============================================================================
+#
+# One LCG step is the affine map x -> (a*x + c) mod m. Maps compose to maps,
+# so X_n = T^n(X_0) falls out of O(log n) squarings of (a, c), with no
+# division by (a - 1) -- which has no inverse mod 2^k whenever a is odd, i.e.
+# for every full-period power-of-two LCG.
+
+def affine_compose(f, g, m):
+    """(f o g) for affine maps f = (a, c), g = (a, c) mod m: x -> f(g(x))."""
+    return (f[0] * g[0] % m, (f[0] * g[1] + f[1]) % m)
+
+
+def affine_power(a, c, n, m):
+    """(A_n, C_n) with T^n(x) = A_n*x + C_n mod m for T(x) = a*x + c."""
+    result, base = (1 % m, 0), (a % m, c % m)
+    while n:
+        if n & 1:
+            result = affine_compose(base, result, m)
+        base = affine_compose(base, base, m)
+        n >>= 1
+    return result
+
+
+def lcg_jump(seed, n, a, c, m):
+    """X_n of the LCG X_{k+1} = (a*X_k + c) mod m, X_0 = seed."""
+    a_n, c_n = affine_power(a, c, n, m)
+    return (a_n * seed + c_n) % m
+
+
+def _residues(values, m, dtype):
+    """values mod m as an array of dtype, without a Python-int detour for int arrays."""
+    arr = np.asarray(values)
+    if dtype is not object and arr.dtype.kind in "iu":
+        return (arr % m).astype(dtype)
+    return np.array([int(v) % m for v in arr.ravel().tolist()], dtype=dtype).reshape(arr.shape)
+
+
+def lcg_jump_batch(seeds, steps, a, c, m):
+    """lcg_jump over arrays of seeds and step counts (broadcast together).
+
+    All the maps involved are powers of the same T and so commute: one pass
+    over the bits of max(steps) squares T once per bit and applies T^(2^b)
+    to the lanes whose step count has bit b set. Lanes are uint64 when
+    m <= 2^32 (a*x + c then cannot overflow) and Python ints otherwise, so
+    2^128 moduli and 10^18 steps work too.
+    """
+    small = m <= 1 << 32
+    dtype = np.uint64 if small else object
+    x = _residues(seeds, m, dtype)
+    steps = np.asarray(steps)
+    if steps.dtype.kind not in "iu":
+        steps = np.array(steps.ravel().tolist(), dtype=object).reshape(steps.shape)
+    x, steps = np.broadcast_arrays(x, steps)
+    x = x.copy()
+    modulus = dtype(m) if small else m
+    base = (a % m, c % m)
+    bit = 0
+    top = int(steps.max()) if steps.size else 0
+    while top >> bit:
+        lanes = ((steps >> bit) & 1).astype(bool)
+        if lanes.any():
+            A, C = (dtype(v) if small else v for v in base)
+            x[lanes] = (A * x[lanes] + C) % modulus
+        base = affine_compose(base, base, m)
+        bit += 1
+    return x
+
+
+
+# ============================================================================
+# Factoring / discrete logarithms
+# ============================================================================
+#
+# discrete_log solves g^x = h (mod p) by Pohlig-Hellman: the group order n of
+# g is factored, x is recovered digit by digit modulo each prime power q^e
+# with baby-step giant-step in the order-q subgroup, and the pieces are
+# joined by CRT. Each BSGS costs O(sqrt(q)) for the largest prime q | n, so
+# smooth orders solve in milliseconds even for 64-bit and larger primes.
+
+BSGS_TABLE_LIMIT = 1 << 20  # baby-step entries; larger q trade memory for giant steps
+_TRIAL_PRIMES = tuple(int(q) for q in primes_up_to(1000))
+
+
+def _pollard_rho(n):
+    """A non-trivial factor of composite n (Brent's variant)."""
+    if n % 2 == 0:
+        return 2
+    for c in range(1, n):
+        y, m, g, r, q = 2, 128, 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+    raise ValueError(f"no factor found for {n}")
+
+
+@lru_cache(maxsize=None)
+def factorize(n):
+    """Prime factorization of n >= 1 as a sorted tuple of (prime, exponent)."""
+    factors = {}
+    for q in _TRIAL_PRIMES:
+        if q * q > n:
+            break
+        while n % q == 0:
+            factors[q] = factors.get(q, 0) + 1
+            n //= q
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+        else:
+            d = _pollard_rho(m)
+            stack += [d, m // d]
+    return tuple(sorted(factors.items()))
+
+
+def multiplicative_order(g, p):
+    """Order of g in (Z/pZ)* for prime p (g not divisible by p)."""
+    n = p - 1
+    for q, _ in factorize(p - 1):
+        while n % q == 0 and pow(g, n // q, p) == 1:
+            n //= q
+    return n
+
+
+class _BabySteps:
+    """g^j -> j for j < m, shared by every target solved against g."""
+
+    def __init__(self, g, order, p, limit):
+        self.m = min(math.isqrt(order - 1) + 1, limit)
+        self.order, self.p = order, p
+        self.table = {}
+        v = 1
+        for j in range(self.m):
+            self.table.setdefault(v, j)
+            v = v * g % p
+        self.stride = pow(g, -self.m, p)
+
+    def solve(self, h):
+        """Smallest x in [0, order) with g^x = h, or None."""
+        gamma = h % self.p
+        for i in range((self.order + self.m - 1) // self.m):
+            j = self.table.get(gamma)
+            if j is not None:
+                return i * self.m + j
+            gamma = gamma * self.stride % self.p
+        return None
+
+
+def _log_solver(g, p, limit):
+    """Per-(g, p) setup: the order of g and one baby-step table per prime
+    q | order; returns solve(h) -> smallest x >= 0 with g^x = h, or None."""
+    n = multiplicative_order(g, p)
+    parts = []
+    for q, e in factorize(n):
+        steps = _BabySteps(pow(g, n // q, p), q, p, limit)
+        parts.append((q, e, steps))
+
+    def solve(h):
+        h %= p
+        if h == 0 or pow(h, n, p) != 1:
+            return None
+        x, mod = 0, 1
+        for q, e, steps in parts:
+            # x mod q^e, one base-q digit at a time.
+            xq, qk = 0, 1
+            for k in range(e):
+                hk = pow(h * pow(g, -xq, p) % p, n // (qk * q), p)
+                d = steps.solve(hk)
+                if d is None:
+                    return None
+                xq += d * qk
+                qk *= q
+            # CRT: x = xq mod qk, x = previous x mod mod.
+            x += mod * ((xq - x) * pow(mod, -1, qk) % qk)
+            mod *= qk
+        return x % n
+
+    return n, solve
+
+
+def discrete_log_batch(queries, positive=False, limit=BSGS_TABLE_LIMIT):
+    """discrete_log over (g, h, p) triples; the order, its factorization and
+    the baby-step tables are built once per distinct (g, p)."""
+    solvers, out = {}, []
+    for g, h, p in queries:
+        if (g % p, p) not in solvers:
+            solvers[g % p, p] = _log_solver(g % p, p, limit)
+        n, solve = solvers[g % p, p]
+        x = solve(h)
+        out.append(n if positive and x == 0 else x)
+    return out
+
+
+def discrete_log(g, h, p, positive=False, limit=BSGS_TABLE_LIMIT):
+    """Smallest x >= 0 (x >= 1 with positive=True) such that g^x = h (mod p)
+    for prime p, or None if h is not a power of g.
+
+    Memory is at most `limit` baby steps per prime factor of the order; time
+    is O(sum of e * sqrt(q)) over q^e || order, so 48-bit and 64-bit primes
+    with smooth p - 1 solve in milliseconds.
+    """
+    return discrete_log_batch([(g, h, p)], positive, limit)[0]
+
+
+# ============================================================================
+# Linear recurrences
+# ============================================================================
+#
+# f(t) = c_1 f(t-1) + ... + c_k f(t-k) mod m, given f(0) .. f(k-1).
+# Small k: powers of the k x k companion matrix, as native int64 while
+# m < 2^31 (each operand is split into 16-bit halves so no dot product can
+# overflow) and Python ints otherwise. Large k: Kitamasa -- x^n reduced
+# modulo the characteristic polynomial in O(k^2 log n), then
+# f(n) = sum r_i f(i).
+
+KITAMASA_ORDER = 32  # recurrences with more terms than this use Kitamasa
+_INT64_MODULUS = 1 << 31
+_SPLIT = 16
+
+
+def _mod_dtype(m):
+    return np.int64 if m < _INT64_MODULUS else object
+
+
+def _matmul_mod(a, b, m):
+    """a @ b mod m; int64 operands are split so no product sum overflows."""
+    if a.dtype == object:
+        return a.dot(b) % m
+    lo = b & ((1 << _SPLIT) - 1)
+    hi = b >> _SPLIT
+    return ((a @ hi % m) * (1 << _SPLIT) + a @ lo) % m
+
+
+def _polymul_mod(a, b, m):
+    """Coefficients of a(x) * b(x) mod m (low degree first)."""
+    if a.dtype == object:
+        out = np.zeros(len(a) + len(b) - 1, dtype=object)
+        for i, v in enumerate(a.tolist()):
+            out[i:i + len(b)] += v * b
+        return out % m
+    lo = b & ((1 << _SPLIT) - 1)
+    hi = b >> _SPLIT
+    return ((np.convolve(a, hi) % m) * (1 << _SPLIT) + np.convolve(a, lo)) % m
+
+
+def _companion(coeffs, m):
+    """T with [f(t+k), ..., f(t+1)] = T [f(t+k-1), ..., f(t)]."""
+    k = len(coeffs)
+    t = np.zeros((k, k), dtype=_mod_dtype(m))
+    t[0] = [c % m for c in coeffs]
+    for i in range(1, k):
+        t[i, i - 1] = 1
+    return t
+
+
+def _check_recurrence(coeffs, initial):
+    if not coeffs or len(initial) != len(coeffs):
+        raise ValueError(f"{len(coeffs)} coefficients need as many initial terms, got {len(initial)}")
+
+
+def linear_recurrence_batch(coeffs, initial, ns, m):
+    """f(n) for every n in `ns` (any shape), matrix path.
+
+    The companion matrix is squared once per bit of max(ns) and applied to
+    the state rows of the lanes whose n has that bit set (as in
+    lcg_jump_batch), so 10^5 values of n up to 10^18 cost about 60 matrix
+    squarings plus 60 batched row updates.
+    """
+    _check_recurrence(coeffs, initial)
+    k = len(coeffs)
+    dtype = _mod_dtype(m)
+    ns = np.asarray(ns)
+    if ns.dtype.kind not in "iu":
+        ns = np.array(ns.ravel().tolist(), dtype=object).reshape(ns.shape)
+    if ns.size and ns.min() < 0:
+        raise ValueError("n must be >= 0")
+    flat = ns.ravel()
+    # Row b is [f(k-1), ..., f(0)] advanced by flat[b] steps.
+    state = np.tile(np.array([v % m for v in initial[::-1]], dtype=dtype), (len(flat), 1))
+    power = _companion(coeffs, m)
+    top = int(flat.max()) if flat.size else 0
+    bit = 0
+    while top >> bit:
+        lanes = ((flat >> bit) & 1).astype(bool)
+        if lanes.any():
+            state[lanes] = _matmul_mod(state[lanes], np.ascontiguousarray(power.T), m)
+        power = _matmul_mod(power, power, m)
+        bit += 1
+    return state[:, k - 1].reshape(ns.shape)
+
+
+def kitamasa(coeffs, initial, n, m):
+    """f(n) from x^n mod (x^k - c_1 x^(k-1) - ... - c_k), O(k^2 log n)."""
+    _check_recurrence(coeffs, initial)
+    k = len(coeffs)
+    if n < k:
+        return initial[n] % m
+    dtype = _mod_dtype(m)
+    tail = np.array([c % m for c in coeffs], dtype=dtype)  # x^k = sum c_i x^(k-i)
+
+    def reduce(poly):
+        poly = poly.copy()
+        for d in range(len(poly) - 1, k - 1, -1):
+            top = poly[d]
+            if top:
+                poly[d - k:d] = (poly[d - k:d] + top * tail[::-1]) % m
+        return poly[:k]
+
+    r = np.zeros(1, dtype=dtype)
+    r[0] = 1 % m
+    for b in bin(n)[2:]:
+        r = reduce(_polymul_mod(r, r, m))
+        if b == "1":
+            r = reduce(np.concatenate([np.zeros(1, dtype=dtype), r]))
+    return sum(int(ri) * (v % m) for ri, v in zip(r.tolist(), initial)) % m
+
+
+def linear_recurrence(coeffs, initial, n, m):
+    """f(n) mod m for f(t) = sum_i coeffs[i-1] * f(t-i), f(0..k-1) = initial.
+
+    Companion-matrix powers up to KITAMASA_ORDER terms, Kitamasa beyond;
+    either way n = 10^18 is about 60 squarings.
+    """
+    if len(coeffs) > KITAMASA_ORDER:
+        return kitamasa(coeffs, initial, n, m)
+    return int(linear_recurrence_batch(coeffs, initial, [n], m)[0])
+
+
+# ============================================================================
+# Power towers / hyperoperations (power_tower, bounded_ackermann)
+# ============================================================================
+#
+# a^e mod m only depends on e mod lambda(m) (Carmichael) once e is at least
+# the largest prime exponent v of m, so a tower a1^a2^...^ak is reduced
+# level by level down the chain m, lambda(m), lambda(lambda(m)), ..., 1.
+# Each level carries the exact value capped at TOWER_CAP alongside the
+# residue, which decides whether the exponent is past v (lift it by
+# lambda until it is) or still small enough to use as is.
+
+TOWER_CAP = 1 << 64  # exact values at or above this only matter mod the chain
+
+
+@lru_cache(maxsize=None)
+def carmichael(n):
+    """(lambda(n), largest prime exponent of n): a^e = a^e' (mod n) for
+    every a whenever e = e' (mod lambda(n)) and e, e' >= that exponent."""
+    lam, top = 1, 0
+    for q, e in factorize(n):
+        if q == 2 and e >= 3:
+            part = 1 << (e - 2)
+        else:
+            part = (q - 1) * q ** (e - 1)
+        lam = lam * part // math.gcd(lam, part)
+        top = max(top, e)
+    return lam, top
+
+
+def _capped_pow(a, e):
+    """min(a^e, TOWER_CAP) for a, e >= 0 (0^0 = 1), with e itself capped."""
+    if e == 0 or a == 1:
+        return 1
+    if a == 0:
+        return 0
+    if e >= TOWER_CAP or e * (a.bit_length() - 1) >= TOWER_CAP.bit_length():
+        return TOWER_CAP
+    return min(a ** e, TOWER_CAP)
+
+
+def _lifted_pow(a, e_mod, e_cap, m):
+    """a^e mod m from e mod lambda(m) and min(e, TOWER_CAP)."""
+    lam, top = carmichael(m)
+    if e_cap < TOWER_CAP and e_cap < top:
+        return pow(a, e_cap, m)
+    e = e_mod
+    while e < top:
+        e += lam
+    return pow(a, e, m)
+
+
+def tower_mod(bases, m):
+    """bases[0] ^ bases[1] ^ ... ^ bases[-1] (right-associative) mod m.
+
+    Any height and any modulus: the residue of each level is only needed
+    mod the next link of the Carmichael chain, so a height-20 tower over a
+    composite modulus costs a few dozen small pow() calls.
+    """
+    if not bases:
+        raise ValueError("empty tower")
+    if any(a < 0 for a in bases):
+        raise ValueError("tower bases must be >= 0")
+    moduli = [m]
+    for _ in bases[1:]:
+        moduli.append(carmichael(moduli[-1])[0])
+    value, cap = bases[-1] % moduli[-1], min(bases[-1], TOWER_CAP)
+    for a, mod in zip(reversed(bases[:-1]), reversed(moduli[:-1])):
+        value, cap = _lifted_pow(a, value, cap, mod), _capped_pow(a, cap)
+    return value
+
+
+def _chain_length(m):
+    """Steps from m down the Carmichael chain to 1."""
+    steps = 0
+    while m > 1:
+        m = carmichael(m)[0]
+        steps += 1
+    return steps
+
+
+def tetration_mod(a, height, m):
+    """a^^height (a tower of `height` copies of a) mod m.
+
+    For a >= 2 every level past the chain length sits far above all the
+    lifting thresholds, so any taller tower has the same residue and
+    heights like 10^100 (or hyperoperation results) cost O(chain length).
+    """
+    if height == 0:
+        return 1 % m
+    if a <= 1:
+        # 0^^h alternates 0, 1, 0, ... (0^0 = 1); 1^^h = 1.
+        return (a if a == 1 or height % 2 else 1) % m
+    return tower_mod([a] * min(height, _chain_length(m) + 4), m)
+
+
+def _hyper_capped(a, n, b):
+    """min(H_n(a, b), TOWER_CAP) for the hyperoperation sequence
+    H_0 = successor, H_1 = +, H_2 = *, H_3 = ^, H_4 = ^^, ..."""
+    if n == 0:
+        return min(b + 1, TOWER_CAP)
+    if n == 1:
+        return min(a + b, TOWER_CAP)
+    if n == 2:
+        return min(a * b, TOWER_CAP)
+    if n == 3:
+        return _capped_pow(a, min(b, TOWER_CAP))
+    if a == 1:
+        return 1
+    x = 1
+    for _ in range(b):
+        x = _capped_pow(a, x) if n == 4 else _hyper_capped(a, n - 1, x)
+        if x >= TOWER_CAP:
+            break
+    return x
+
+
+def hyperop_mod(a, n, b, m):
+    """H_n(a, b) mod m (H_1 = +, H_2 = *, H_3 = ^, H_4 = tetration, ...).
+
+    For n >= 5, H_n(a, b) = H_{n-1}(a, H_n(a, b - 1)) unrolls to a tower of
+    a's whose height is either small enough to compute exactly or past
+    TOWER_CAP, where the tower residue no longer depends on the height.
+    """
+    if a < 1 or b < 0 or n < 0:
+        raise ValueError("hyperop_mod needs a >= 1, b >= 0, n >= 0")
+    if n == 0:
+        return (b + 1) % m
+    if n == 1:
+        return (a + b) % m
+    if n == 2:
+        return a * b % m
+    if n == 3:
+        return pow(a, b, m)
+    if n == 4:
+        return tetration_mod(a, b, m)
+    if b == 0:
+        return 1 % m
+    inner = _hyper_capped(a, n, b - 1)
+    if inner >= TOWER_CAP:
+        return tetration_mod(a, TOWER_CAP, m)
+    return hyperop_mod(a, n - 1, inner, m)
+
+
+def ackermann_mod(m, n, modulus):
+    """Ackermann-Peter A(m, n) mod `modulus`, via A(m, n) = H_m(2, n + 3) - 3."""
+    if m < 0 or n < 0:
+        raise ValueError("ackermann_mod needs m, n >= 0")
+    return (hyperop_mod(2, m, n + 3, modulus) - 3) % modulus
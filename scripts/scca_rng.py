@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Mulberry32 PRNG for the dataset build scripts.
+
+Bit-identical to lib/engine/rng.ts. The scalar path (calling the stream) is a
+straight port; the block path draws N values as one NumPy uint32 computation,
+so machine-scale haystacks can be built from whole arrays instead of N Python
+calls. Both paths advance the same stream, so they can be freely interleaved:
+
+    rng = mulberry32(seed)
+    floats = rng.block(250000)        # draws 1..250000
+    idx = mulberry32_int(rng, 0, 9)   # draw 250001
+
+The state advances by a constant per draw, so any draw is also reachable
+directly: draw_at(seed, k) and draws(seed, start, stop) (0-based, half-open)
+let a long stream be generated in independent chunks, or a single planted
+index be audited without regenerating the stream.
+
+This is the one Python mulberry32 module: scca_architect.py, build_tier2.py
+and build_dataset_v2.py all import their stream and derived draws (integers,
+choices, shuffles, hex strings, normals) from here.
+"""
+
+import math
+
+import numpy as np
+
+
+# ============================================================================
+# Mulberry32 core -- must match TypeScript implementation exactly
+# ============================================================================
+
+MULBERRY32_INCREMENT = 0x6D2B79F5
+U32_MASK = 0xFFFFFFFF
+U32_RANGE = 4294967296
+
+
+def _imul(a, b):
+    """Emulate JavaScript Math.imul (32-bit integer multiply)."""
+    return ((a & U32_MASK) * (b & U32_MASK)) & U32_MASK
+
+
+def mix_u32(state):
+    """Mulberry32 output function for one already-advanced 32-bit state."""
+    t = _imul(state ^ (state >> 15), state | 1)
+    t = (t ^ ((t + _imul(t ^ (t >> 7), t | 61)) & U32_MASK)) & U32_MASK
+    return (t ^ (t >> 14)) & U32_MASK
+
+
+def mix_u32_array(states):
+    """Vectorized mix_u32 over a uint32 array (uint32 arithmetic wraps like imul)."""
+    t = np.asarray(states, dtype=np.uint32)
+    t = (t ^ (t >> np.uint32(15))) * (t | np.uint32(1))
+    t = t ^ (t + (t ^ (t >> np.uint32(7))) * (t | np.uint32(61)))
+    return t ^ (t >> np.uint32(14))
+
+
+def state_at(seed, k):
+    """Internal state just before draw k (0-based) of the stream for `seed`.
+
+    The state only ever advances by MULBERRY32_INCREMENT, so it is a closed
+    form in k: no need to replay the first k draws.
+    """
+    return ((seed & U32_MASK) + k * MULBERRY32_INCREMENT) & U32_MASK
+
+
+def draw_at_u32(seed, k):
+    """Raw uint32 output of draw k (0-based) of the stream for `seed`."""
+    return mix_u32((state_at(seed, k) + MULBERRY32_INCREMENT) & U32_MASK)
+
+
+def draw_at(seed, k):
+    """Draw k (0-based) of mulberry32(seed), i.e. the (k+1)-th rng() value."""
+    return draw_at_u32(seed, k) / U32_RANGE
+
+
+def draws_u32(seed, start, stop):
+    """Draws start..stop-1 (0-based) of the stream for `seed` as raw uint32.
+
+    Chunks are independent, so a long stream can be built as
+    draws_u32(seed, 0, n) == concat(draws_u32(seed, a, b) for each [a, b)).
+    """
+    steps = np.arange(start + 1, stop + 1, dtype=np.uint64) & np.uint64(U32_MASK)
+    states = ((seed & U32_MASK) + steps * np.uint64(MULBERRY32_INCREMENT)) & np.uint64(U32_MASK)
+    return mix_u32_array(states.astype(np.uint32))
+
+
+def draws(seed, start, stop):
+    """Draws start..stop-1 (0-based) of mulberry32(seed) as floats in [0, 1)."""
+    return draws_u32(seed, start, stop) / U32_RANGE
+
+
+def mulberry32_block_u32(seed, n):
+    """Draws 1..n of the stream for `seed` as raw uint32 outputs."""
+    return draws_u32(seed, 0, n)
+
+
+def mulberry32_block(seed, n):
+    """Draws 1..n of the stream for `seed` as floats in [0, 1)."""
+    return mulberry32_block_u32(seed, n) / U32_RANGE
+
+
+class Mulberry32:
+    """A mulberry32 stream. Call it for one float, or use block() for many."""
+
+    def __init__(self, seed):
+        self.state = seed & U32_MASK
+
+    def __call__(self):
+        self.state = (self.state + MULBERRY32_INCREMENT) & U32_MASK
+        return mix_u32(self.state) / U32_RANGE
+
+    def skip(self, n):
+        """Jump ahead n draws without computing them."""
+        self.state = state_at(self.state, n)
+
+    def block_u32(self, n):
+        """The next n raw uint32 outputs, advancing the stream by n."""
+        out = mulberry32_block_u32(self.state, n)
+        self.skip(n)
+        return out
+
+    def block(self, n):
+        """The next n floats in [0, 1), advancing the stream by n."""
+        return self.block_u32(n) / U32_RANGE
+
+
+def mulberry32(seed):
+    """Port of the JS mulberry32 PRNG. Returns a stream yielding floats in [0,1)."""
+    return Mulberry32(seed)
+
+
+# ============================================================================
+# Derived draws -- scalar path (rng()) and block path (rng.block(n))
+# ============================================================================
+# Every *_block helper returns exactly what the matching scalar helper would
+# for the same stream position, and advances the stream by the same number
+# of draws. The integer helpers come in both conventions used by the
+# builders: mulberry32_int is inclusive [min_val, max_val] (SeededRNG.int in
+# rng.ts); mulberry32_randint is half-open [lo, hi).
+
+HEX_DIGITS = "0123456789abcdef"
+_HEX_LUT = np.frombuffer(HEX_DIGITS.encode("ascii"), dtype=np.uint8)
+_LETTER_LUT = np.frombuffer(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", dtype=np.uint8)
+
+
+def mulberry32_int(rng, min_val, max_val):
+    """Random integer in [min_val, max_val] inclusive."""
+    return math.floor(rng() * (max_val - min_val + 1)) + min_val
+
+
+def mulberry32_int_block(rng, min_val, max_val, n):
+    """n draws of mulberry32_int(rng, min_val, max_val) as an int64 array."""
+    return np.floor(rng.block(n) * (max_val - min_val + 1)).astype(np.int64) + min_val
+
+
+def mulberry32_randint(rng, lo, hi):
+    """Random integer in [lo, hi) (same draw as mulberry32_int(rng, lo, hi - 1))."""
+    return lo + int(rng() * (hi - lo))
+
+
+def mulberry32_randint_block(rng, lo, hi, n):
+    """n draws of mulberry32_randint(rng, lo, hi) as an int64 array."""
+    return mulberry32_int_block(rng, lo, hi - 1, n)
+
+
+def mulberry32_choice(rng, arr):
+    """Pick random element from array."""
+    return arr[math.floor(rng() * len(arr))]
+
+
+def mulberry32_choices(rng, arr, k):
+    """Pick k elements with replacement."""
+    return [mulberry32_choice(rng, arr) for _ in range(k)]
+
+
+def mulberry32_choices_block(rng, arr, k):
+    """mulberry32_choices(rng, arr, k) from one block."""
+    return [arr[j] for j in mulberry32_int_block(rng, 0, len(arr) - 1, k).tolist()]
+
+
+def mulberry32_shuffle(rng, arr):
+    """Fisher-Yates shuffle in place (same order of draws as SeededRNG.shuffle)."""
+    for j in range(len(arr) - 1, 0, -1):
+        k = mulberry32_int(rng, 0, j)
+        arr[j], arr[k] = arr[k], arr[j]
+
+
+def mulberry32_shuffle_block(rng, arr):
+    """mulberry32_shuffle(rng, arr) with all swap targets drawn in one block."""
+    n = len(arr)
+    if n < 2:
+        return
+    bounds = np.arange(n, 1, -1)  # j + 1 for j = n-1 .. 1
+    targets = np.floor(rng.block(n - 1) * bounds).astype(np.int64).tolist()
+    for j, k in zip(range(n - 1, 0, -1), targets):
+        arr[j], arr[k] = arr[k], arr[j]
+
+
+def mulberry32_hex_char(rng):
+    return HEX_DIGITS[math.floor(rng() * 16)]
+
+
+def mulberry32_hex_string(rng, length):
+    return "".join(mulberry32_hex_char(rng) for _ in range(length))
+
+
+def mulberry32_nibble_block(rng, length):
+    """Hex digit values (0-15) as uint8: floor(u * 16) == u32 >> 28 exactly."""
+    return (rng.block_u32(length) >> np.uint32(28)).astype(np.uint8)
+
+
+def mulberry32_hex_block(rng, length):
+    """mulberry32_hex_string(rng, length) via the nibble lookup table."""
+    return _HEX_LUT[mulberry32_nibble_block(rng, length)].tobytes().decode("ascii")
+
+
+def mulberry32_normal_pair(rng):
+    """One Box-Muller pair (z0, z1) from two draws; u1 is clamped to 1e-10."""
+    u1 = max(rng(), 1e-10)
+    u2 = rng()
+    z0 = math.sqrt(-2 * math.log(u1)) * math.cos(2 * math.pi * u2)
+    z1 = math.sqrt(-2 * math.log(u1)) * math.sin(2 * math.pi * u2)
+    return z0, z1
+
+
+def mulberry32_normals(rng, n):
+    """n N(0,1) values: n // 2 + 1 Box-Muller pairs, flattened and truncated."""
+    floats = []
+    for _ in range(n // 2 + 1):
+        floats.extend(mulberry32_normal_pair(rng))
+    return floats[:n]
+
+
+def mulberry32_normals_block(rng, n):
+    """mulberry32_normals(rng, n) as a float64 array, bit-identical.
+
+    Uniforms, clamping, sqrt and products are NumPy (IEEE-exact); log, cos
+    and sin go through math.* because NumPy's SIMD kernels may differ from
+    libm by an ulp (np.log does on ~0.3% of inputs).
+    """
+    pairs = n // 2 + 1
+    u = rng.block(2 * pairs)
+    u1 = np.maximum(u[0::2], 1e-10)
+    theta = 2 * math.pi * u[1::2]
+    theta_list = theta.tolist()
+    log_u1 = np.fromiter(map(math.log, u1.tolist()), dtype=np.float64, count=pairs)
+    radius = np.sqrt(-2 * log_u1)
+    out = np.empty(2 * pairs)
+    out[0::2] = radius * np.fromiter(map(math.cos, theta_list), dtype=np.float64, count=pairs)
+    out[1::2] = radius * np.fromiter(map(math.sin, theta_list), dtype=np.float64, count=pairs)
+    return out[:n]
+
+
+# ============================================================================
+# Lane-parallel streams -- one mulberry32 stream per seed, in lockstep
+# ============================================================================
+# For running one generator across many seeds: lane i of every draw is the
+# next value of mulberry32(seeds[i]). Generators whose draw count does not
+# depend on the drawn values (shuffles, fixed-length strings, fixed-size
+# tables) advance all lanes with one array operation per draw, and produce
+# a columnar batch whose row i equals the scalar generator for seeds[i].
+
+class Mulberry32Lanes:
+    """len(seeds) mulberry32 streams advanced together."""
+
+    def __init__(self, seeds):
+        self.states = np.array([s & U32_MASK for s in seeds], dtype=np.uint64)
+
+    def __len__(self):
+        return len(self.states)
+
+    def block_u32(self, n):
+        """The next n raw uint32 outputs of every lane, shape (lanes, n)."""
+        steps = np.arange(1, n + 1, dtype=np.uint64) * np.uint64(MULBERRY32_INCREMENT)
+        states = (self.states[:, None] + steps[None, :]) & np.uint64(U32_MASK)
+        self.states = (self.states + np.uint64(n * MULBERRY32_INCREMENT)) & np.uint64(U32_MASK)
+        return mix_u32_array(states.astype(np.uint32))
+
+    def block(self, n):
+        """The next n floats in [0, 1) of every lane, shape (lanes, n)."""
+        return self.block_u32(n) / U32_RANGE
+
+    def __call__(self):
+        """One float per lane, shape (lanes,)."""
+        return self.block(1)[:, 0]
+
+
+def mulberry32_int_lanes(lanes, min_val, max_val, n=None):
+    """mulberry32_int per lane: shape (lanes,), or (lanes, n) for n draws each."""
+    u = lanes() if n is None else lanes.block(n)
+    return np.floor(u * (max_val - min_val + 1)).astype(np.int64) + min_val
+
+
+def mulberry32_randint_lanes(lanes, lo, hi, n=None):
+    """mulberry32_randint per lane (half-open [lo, hi))."""
+    return mulberry32_int_lanes(lanes, lo, hi - 1, n)
+
+
+def mulberry32_shuffle_lanes(lanes, table):
+    """mulberry32_shuffle applied to each row of a (lanes, n) array, in place."""
+    n = table.shape[1]
+    if n < 2:
+        return
+    rows = np.arange(len(lanes))
+    bounds = np.arange(n, 1, -1)  # j + 1 for j = n-1 .. 1
+    targets = np.floor(lanes.block(n - 1) * bounds).astype(np.int64)
+    for step, j in enumerate(range(n - 1, 0, -1)):
+        k = targets[:, step]
+        swap = table[rows, k]
+        table[rows, k] = table[:, j]
+        table[:, j] = swap
+
+
+def letter_strings(idx):
+    """(n, k) letter indices 0-25 -> length-n array of k-letter uppercase
+    strings, e.g. lane draws from mulberry32_int_lanes(lanes, 0, 25, k)."""
+    idx = np.asarray(idx)
+    k = idx.shape[1]
+    return np.ascontiguousarray(_LETTER_LUT[idx]).view(f"S{k}")[:, 0].astype(f"U{k}")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Constraint-driven seed search for generators whose answers must have a
+property (in a range, distinct across the batch, unique, ...).
+
+seed_search(build, accept, n, start) tries seeds start, start + stride, ...
+in order and returns the first n whose item accept() passes. accept returns
+a list of problems, empty when the item is usable, like the scca_needles
+checks (which can be passed straight in). `key` adds a batch-level
+constraint: an item whose key matches an already accepted item is rejected,
+which makes the answers distinct across the batch.
+
+Candidates are built and checked in rounds of workers * SEARCH_CHUNK seeds
+over a process pool, and accepted in seed order after each round, so the
+result is the same for any worker count. With a cache path, per-item
+rejections are stored on disk (JSON, keyed by generator and predicate) and
+those seeds are skipped without being rebuilt on the next run; bump `tag`
+when the generator changes. Batch-level (key) rejections depend on what
+else was accepted, so they are never cached.
+"""
+
+import json
+import os
+from multiprocessing import Pool
+from pathlib import Path
+
+
+SEARCH_CHUNK = 64  # seeds per worker per round
+SEARCH_LIMIT = 10_000  # candidate seeds tried before giving up
+
+
+# ============================================================================
+# Checks
+# ============================================================================
+
+def in_range(value, lo, hi, what="answer"):
+    """lo <= value <= hi."""
+    return [] if lo <= value <= hi else [f"{what} {value} outside [{lo}, {hi}]"]
+
+
+def verify_distinct(values, what="answers"):
+    """No value appears twice."""
+    seen, repeats = set(), set()
+    for v in values:
+        (repeats if v in seen else seen).add(v)
+    return [f"{what} repeat: {sorted(repeats, key=str)}"] if repeats else []
+
+
+# ============================================================================
+# Search
+# ============================================================================
+
+def _default_tag(build, accept):
+    name = lambda f: f"{getattr(f, '__module__', '?')}.{getattr(f, '__qualname__', repr(f))}"
+    return f"{name(build)}|{name(accept)}"
+
+
+def _load_cache(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _save_cache(path, cache):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _evaluate(args):
+    build, accept, seed = args
+    item = build(seed)
+    return seed, item, accept(item)
+
+
+def seed_search(build, accept, n, start, stride=1, key=None, workers=1,
+                cache_path=None, tag=None, limit=SEARCH_LIMIT):
+    """First n seeds (in order start, start + stride, ...) whose build(seed)
+    passes accept() and, with `key`, has a key no earlier accepted item has.
+
+    build and accept must be module-level functions (or functools.partial of
+    them) when workers > 1, so the pool can pickle them.
+
+    Returns [(seed, item)] in seed order; ValueError if `limit` candidates
+    do not yield n.
+    """
+    tag = tag or _default_tag(build, accept)
+    cache = _load_cache(cache_path) if cache_path else {}
+    rejected = cache.setdefault(tag, {})
+    dirty = False
+
+    accepted, keys = [], set()
+    candidates = (start + k * stride for k in range(limit))
+    round_size = max(1, workers) * SEARCH_CHUNK
+    pool = Pool(workers) if workers > 1 else None
+    try:
+        run = (lambda xs: pool.map(_evaluate, xs, chunksize=SEARCH_CHUNK)) if pool else (
+            lambda xs: [_evaluate(x) for x in xs])
+        exhausted = False
+        while len(accepted) < n and not exhausted:
+            batch = []
+            for seed in candidates:
+                if str(seed) not in rejected:
+                    batch.append((build, accept, seed))
+                # Without a pool, build only as many as are still needed.
+                if len(batch) >= (round_size if pool else n - len(accepted)):
+                    break
+            else:
+                exhausted = True
+            for seed, item, problems in run(batch):
+                if problems:
+                    rejected[str(seed)] = problems
+                    dirty = True
+                    continue
+                if key is not None:
+                    k = key(item)
+                    if k in keys:
+                        continue
+                    keys.add(k)
+                accepted.append((seed, item))
+                if len(accepted) == n:
+                    break
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+        if cache_path and dirty:
+            _save_cache(cache_path, cache)
+
+    if len(accepted) < n:
+        raise ValueError(f"only {len(accepted)} of {n} seeds accepted in {limit} candidates from {start}")
+    return accepted